@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+BreezeFrame Affinity Router
+Frontal de routage par contenu d'image devant plusieurs backends
+
+Chaque requête est associée à une clé (SHA-256 de l'image décodée pour
+/analyze, du corps sinon) placée sur un anneau de hachage cohérent (nœuds
+virtuels). Une même photo revient donc toujours sur le même nœud, tant que
+celui-ci n'est pas surchargé : la charge en cours d'un nœud est bornée à
+``load_factor`` fois la moyenne (hachage cohérent à charge bornée) ; au-delà
+la requête passe au nœud suivant sur l'anneau.
+
+L'ajout ou le retrait d'un nœud ne déplace que les clés de ses segments de
+l'anneau (environ 1/N des clés). Les nœuds qui échouent au contrôle /health
+sont retirés de l'anneau puis réintégrés dès qu'ils répondent de nouveau.
+
+Administration (en-tête X-Admin-Token: <BREEZEFRAME_ADMIN_TOKEN> requis) :
+    GET    /router/stats                  - charge, part de l'anneau, taux de hit par nœud
+    POST   /router/nodes  {"url": "..."}  - ajoute un nœud
+    DELETE /router/nodes  {"url": "..."}  - retire un nœud
+
+Exemples :
+    python affinity_router.py --node http://localhost:5001 --node http://localhost:5002
+    python affinity_router.py --spawn 3 --base-port 5001 --port 8000
+"""
+
+import argparse
+import base64
+import bisect
+import hashlib
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+
+from profiling import is_admin
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('affinity_router')
+
+# Configuration
+VIRTUAL_NODES = int(os.environ.get('ROUTER_VIRTUAL_NODES', '160'))
+LOAD_FACTOR = float(os.environ.get('ROUTER_LOAD_FACTOR', '1.25'))
+KEY_MEMORY = int(os.environ.get('ROUTER_KEY_MEMORY', '10000'))
+HEALTH_INTERVAL = float(os.environ.get('ROUTER_HEALTH_INTERVAL', '5'))
+
+# En-têtes relayés vers les backends et vers le client (jamais le jeton admin :
+# les opérations d'administration se font directement sur chaque nœud)
+FORWARDED_REQUEST_HEADERS = ('Content-Type', 'Accept')
+FORWARDED_RESPONSE_HEADERS = ('Content-Type', 'Vary')
+
+def hash_position(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big')
+
+def affinity_key(path: str, body: bytes) -> bytes:
+    """Empreinte du contenu de l'image (indépendante de l'encodage data URL)"""
+    if path.startswith('/analyze') and body:
+        try:
+            image_data = json.loads(body).get('image')
+            if isinstance(image_data, str):
+                if image_data.startswith('data:image'):
+                    image_data = image_data.split(',', 1)[1]
+                return hashlib.sha256(base64.b64decode(image_data)).digest()
+        except (ValueError, AttributeError):
+            pass
+    return hashlib.sha256(body).digest()
+
+class NodeStats:
+    """Compteurs d'un nœud : charge en cours et localité des clés"""
+
+    def __init__(self, url: str, key_memory: int = KEY_MEMORY):
+        self.url = url
+        self.in_flight = 0
+        self.requests = 0
+        self.home_requests = 0
+        self.spilled_in = 0
+        self.repeat_hits = 0
+        self.errors = 0
+        self.healthy = True
+        self.key_memory = key_memory
+        # Clés récemment servies (LRU) pour estimer le taux de hit du cache du nœud
+        self.recent_keys = OrderedDict()
+
+    def record_key(self, key: bytes) -> bool:
+        hit = key in self.recent_keys
+        if hit:
+            self.recent_keys.move_to_end(key)
+        else:
+            self.recent_keys[key] = None
+            if len(self.recent_keys) > self.key_memory:
+                self.recent_keys.popitem(last=False)
+        return hit
+
+    def as_dict(self, ring_share: float) -> dict:
+        return {
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'errors': self.errors,
+            'ring_share': round(ring_share, 4),
+            'home_rate': round(self.home_requests / self.requests, 4) if self.requests else None,
+            'spilled_in': self.spilled_in,
+            'hit_rate': round(self.repeat_hits / self.requests, 4) if self.requests else None
+        }
+
+class AffinityRing:
+    """Anneau de hachage cohérent à charge bornée"""
+
+    def __init__(self, virtual_nodes: int = VIRTUAL_NODES, load_factor: float = LOAD_FACTOR):
+        self.virtual_nodes = virtual_nodes
+        self.load_factor = load_factor
+        self.lock = threading.Lock()
+        self.nodes: Dict[str, NodeStats] = {}
+        self.positions: List[int] = []
+        self.owners: List[str] = []
+        self.total_in_flight = 0
+
+    def _rebuild(self):
+        points = sorted(
+            (hash_position(f'{url}#{i}'.encode()), url)
+            for url, node in self.nodes.items() if node.healthy
+            for i in range(self.virtual_nodes)
+        )
+        self.positions = [position for position, _ in points]
+        self.owners = [url for _, url in points]
+
+    def add(self, url: str) -> bool:
+        with self.lock:
+            if url in self.nodes:
+                return False
+            self.nodes[url] = NodeStats(url)
+            self._rebuild()
+        logger.info(f"➕ Nœud ajouté: {url}")
+        return True
+
+    def remove(self, url: str) -> bool:
+        with self.lock:
+            if self.nodes.pop(url, None) is None:
+                return False
+            self._rebuild()
+        logger.info(f"➖ Nœud retiré: {url}")
+        return True
+
+    def set_healthy(self, url: str, healthy: bool):
+        with self.lock:
+            node = self.nodes.get(url)
+            if node is None or node.healthy == healthy:
+                return
+            node.healthy = healthy
+            self._rebuild()
+        logger.warning(f"{'✅' if healthy else '⚠️'} Nœud {'réintégré' if healthy else 'hors anneau'}: {url}")
+
+    def capacity(self) -> int:
+        """Charge maximale d'un nœud pour la prochaine requête"""
+        healthy = sum(1 for node in self.nodes.values() if node.healthy)
+        return math.ceil(self.load_factor * (self.total_in_flight + 1) / healthy)
+
+    def acquire(self, key: bytes) -> Optional[str]:
+        """Choisit le nœud de la clé et compte la requête comme en cours"""
+        with self.lock:
+            if not self.owners:
+                return None
+
+            capacity = self.capacity()
+            start = bisect.bisect(self.positions, hash_position(key)) % len(self.positions)
+            home = self.owners[start]
+            chosen = None
+            visited = set()
+            # Premier nœud de l'anneau sous la borne de charge
+            for offset in range(len(self.owners)):
+                url = self.owners[(start + offset) % len(self.owners)]
+                if url in visited:
+                    continue
+                visited.add(url)
+                if self.nodes[url].in_flight < capacity:
+                    chosen = url
+                    break
+
+            node = self.nodes[chosen or home]
+            node.in_flight += 1
+            node.requests += 1
+            if node.url == home:
+                node.home_requests += 1
+            else:
+                node.spilled_in += 1
+            if node.record_key(key):
+                node.repeat_hits += 1
+            self.total_in_flight += 1
+            return node.url
+
+    def release(self, url: str, failed: bool = False):
+        with self.lock:
+            self.total_in_flight -= 1
+            node = self.nodes.get(url)
+            if node is not None:
+                node.in_flight -= 1
+                if failed:
+                    node.errors += 1
+
+    def ring_shares(self) -> Dict[str, float]:
+        """Part de l'espace de hachage possédée par chaque nœud"""
+        shares = {url: 0.0 for url in self.nodes}
+        space = float(2 ** 64)
+        for i, position in enumerate(self.positions):
+            previous = self.positions[i - 1] if i else self.positions[-1] - 2 ** 64
+            shares[self.owners[i]] += (position - previous) / space
+        return shares
+
+    def stats(self) -> dict:
+        with self.lock:
+            shares = self.ring_shares()
+            total = sum(node.requests for node in self.nodes.values())
+            hits = sum(node.repeat_hits for node in self.nodes.values())
+            return {
+                'nodes': {url: node.as_dict(shares[url]) for url, node in self.nodes.items()},
+                'virtual_nodes': self.virtual_nodes,
+                'load_factor': self.load_factor,
+                'in_flight': self.total_in_flight,
+                'requests': total,
+                'hit_rate': round(hits / total, 4) if total else None
+            }
+
+class HealthChecker:
+    """Retire de l'anneau les nœuds qui ne répondent plus à /health"""
+
+    def __init__(self, ring: AffinityRing, interval: float = HEALTH_INTERVAL):
+        self.ring = ring
+        self.interval = interval
+        self.thread = threading.Thread(target=self._run, name='router-health', daemon=True)
+
+    def start(self):
+        if self.interval > 0:
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            for url in list(self.ring.nodes):
+                try:
+                    response = requests.get(url.rstrip('/') + '/health', timeout=2)
+                    # Un worker en cours de recyclage répond 'draining'
+                    healthy = response.ok and response.json().get('status') == 'healthy'
+                except (requests.RequestException, ValueError):
+                    healthy = False
+                self.ring.set_healthy(url, healthy)
+            time.sleep(self.interval)
+
+def make_handler(ring: AffinityRing, timeout: float):
+    session = requests.Session()
+
+    class RouterHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get('Content-Length') or 0)
+            return self.rfile.read(length) if length else b''
+
+        def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+            self.send_response(status)
+            headers = headers or {'Content-Type': 'application/json'}
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status: int, payload: dict):
+            self._send(status, json.dumps(payload).encode('utf-8'))
+
+        def _admin(self, method: str, body: bytes):
+            """Endpoints /router/* (jeton admin requis)"""
+            if not is_admin(self.headers.get('X-Admin-Token')):
+                self._send_json(403, {'success': False, 'error': 'Admin token required'})
+            elif self.path == '/router/stats' and method == 'GET':
+                self._send_json(200, ring.stats())
+            elif self.path == '/router/nodes' and method in ('POST', 'DELETE'):
+                try:
+                    url = json.loads(body)['url']
+                except (ValueError, KeyError, TypeError):
+                    self._send_json(400, {'success': False, 'error': 'Node url required'})
+                    return
+                changed = ring.add(url) if method == 'POST' else ring.remove(url)
+                self._send_json(200, {'success': True, 'changed': changed, 'nodes': list(ring.nodes)})
+            else:
+                self._send_json(404, {'success': False, 'error': 'Endpoint not found'})
+
+        def _proxy(self, method: str):
+            body = self._read_body()
+            if self.path.startswith('/router/'):
+                self._admin(method, body)
+                return
+
+            node = ring.acquire(affinity_key(self.path, body))
+            if node is None:
+                self._send_json(503, {'success': False, 'error': 'No backend available'})
+                return
+
+            failed = False
+            try:
+                response = session.request(
+                    method, node.rstrip('/') + self.path, data=body or None, timeout=timeout,
+                    headers={name: self.headers[name] for name in FORWARDED_REQUEST_HEADERS if name in self.headers}
+                )
+                failed = response.status_code >= 500
+                headers = {name: response.headers[name] for name in FORWARDED_RESPONSE_HEADERS if name in response.headers}
+                headers['X-Routed-Node'] = node
+                self._send(response.status_code, response.content, headers)
+            except requests.RequestException as e:
+                failed = True
+                logger.error(f"❌ Nœud {node} injoignable: {e}")
+                self._send_json(502, {'success': False, 'error': 'Backend unavailable', 'node': node})
+            finally:
+                ring.release(node, failed)
+
+        def do_GET(self):
+            self._proxy('GET')
+
+        def do_POST(self):
+            self._proxy('POST')
+
+        def do_DELETE(self):
+            self._proxy('DELETE')
+
+    return RouterHandler
+
+def spawn_backends(count: int, base_port: int) -> List[subprocess.Popen]:
+    """Lance des backends locaux (app.py) sur des ports consécutifs"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    processes = []
+    for i in range(count):
+        env = dict(os.environ, PORT=str(base_port + i), DEBUG='false')
+        processes.append(subprocess.Popen([sys.executable, script], env=env))
+        logger.info(f"🚀 Backend local lancé sur le port {base_port + i} (pid {processes[-1].pid})")
+    return processes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Routeur BreezeFrame à affinité de contenu")
+    parser.add_argument('--node', action='append', default=[], help="URL d'un backend (répétable)")
+    parser.add_argument('--spawn', type=int, default=0, help="Nombre de backends locaux à lancer")
+    parser.add_argument('--base-port', type=int, default=5001, help="Premier port des backends lancés")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('--virtual-nodes', type=int, default=VIRTUAL_NODES)
+    parser.add_argument('--load-factor', type=float, default=LOAD_FACTOR,
+                        help="Charge max d'un nœud par rapport à la moyenne (> 1)")
+    parser.add_argument('--health-interval', type=float, default=HEALTH_INTERVAL,
+                        help="Intervalle des contrôles /health en secondes (0 = désactivé)")
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    if args.load_factor <= 1:
+        parser.error("--load-factor doit être supérieur à 1")
+
+    processes = spawn_backends(args.spawn, args.base_port)
+    nodes = args.node + [f'http://127.0.0.1:{args.base_port + i}' for i in range(args.spawn)]
+    if not nodes:
+        parser.error("Au moins un nœud (--node ou --spawn) est requis")
+
+    ring = AffinityRing(args.virtual_nodes, args.load_factor)
+    for url in nodes:
+        ring.add(url)
+    HealthChecker(ring, args.health_interval).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(ring, args.timeout))
+    logger.info(f"🌐 Routeur à affinité sur http://{args.host}:{args.port} ({len(nodes)} nœuds)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Routeur arrêté")
+    finally:
+        server.server_close()
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,7 +4,9 @@ BreezeFrame Python Backend Server
 Serveur API Flask pour l'analyse IA de fenêtres
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from werkzeug.wsgi import get_input_stream
 from flask_cors import CORS
 import logging
 import os
@@ -13,10 +15,18 @@ import json
 import base64
 import io
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from PIL import Image
 import numpy as np
 
+from columnar import ApiDetectionBatch
+from memory_monitor import memory_report, memory_stats, recycler, snapshots
+from profiling import StageTimer, is_admin, requested_profiler
+from serialization import encode_json, encode_response
+from stream_ingest import StreamFormatError, open_entries, stream_analyze
+from traffic_capture import recorder as capture_recorder
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,15 +38,34 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
 # Configuration CORS pour permettre les requêtes depuis le frontend
-CORS(app, origins=[
+CORS_ORIGINS = [
     "http://localhost:3000",
     "http://localhost:3001", 
     "http://127.0.0.1:3000",
     "http://127.0.0.1:3001"
-])
+]
+CORS(app, origins=CORS_ORIGINS)
 
 # Configuration
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+
+BACKEND_VERSION = '2.1.0'
+
+# Ingestion en flux (/batch-analyze/stream) : la mémoire dépend de la fenêtre,
+# pas de la taille du lot
+STREAM_WINDOW = int(os.environ.get('STREAM_WINDOW', '16'))
+STREAM_WORKERS = int(os.environ.get('STREAM_WORKERS', '4'))
+STREAM_MAX_ENTRY_BYTES = int(os.environ.get('STREAM_MAX_ENTRY_BYTES', str(MAX_CONTENT_LENGTH)))
+stream_executor = ThreadPoolExecutor(max_workers=STREAM_WORKERS, thread_name_prefix='stream-ingest')
+
+# Contenu statique des recommandations (partagé entre toutes les réponses)
+KIT_FEATURES = (
+    'Capteurs de luminosité',
+    'Contrôle automatique',
+    'Application mobile',
+    'Garantie 2 ans'
+)
 
 # Tentative d'import des modules d'IA
 try:
@@ -63,8 +92,11 @@ STATS = {
     'opencv_available': OPENCV_AVAILABLE
 }
 
+# WindowAnalyzer (modèle TensorFlow remplaçable à chaud), chargé au démarrage
+WINDOW_ANALYZER = None
+
 def preprocess_image(image_data):
-    """Préprocesse l'image pour l'analyse"""
+    """Préprocesse l'image (base64) pour l'analyse"""
     try:
         # Supprimer le préfixe data:image si présent
         if image_data.startswith('data:image'):
@@ -72,6 +104,15 @@ def preprocess_image(image_data):
         
         # Décoder base64
         image_bytes = base64.b64decode(image_data)
+    except Exception as e:
+        logger.error(f"Erreur préprocessing image: {e}")
+        return None, None
+    
+    return preprocess_image_bytes(image_bytes)
+
+def preprocess_image_bytes(image_bytes):
+    """Préprocesse l'image (octets bruts) pour l'analyse"""
+    try:
         image = Image.open(io.BytesIO(image_bytes))
         
         # Convertir en RGB si nécessaire
@@ -251,80 +292,93 @@ def generate_window_analysis(detection_result):
         'kit_recommendation': {
             'type': kit_type,
             'price': kit_price,
-            'features': [
-                'Capteurs de luminosité',
-                'Contrôle automatique',
-                'Application mobile',
-                'Garantie 2 ans'
-            ]
+            'features': KIT_FEATURES
         },
         'quality_score': quality_score,
         'processing_info': {
             'method': detection_result.get('method', 'unknown'),
             'timestamp': datetime.now().isoformat(),
-            'backend_version': '2.1.0'
+            'backend_version': BACKEND_VERSION
         }
     }
 
-# Routes API
+def parse_json_body(load_data):
+    """JSON de la requête ; ValueError si le corps est invalide
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Vérification de santé du serveur"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'BreezeFrame Python Backend',
-        'version': '2.1.0',
-        'timestamp': datetime.now().isoformat(),
-        'tensorflow_available': TENSORFLOW_AVAILABLE,
-        'opencv_available': OPENCV_AVAILABLE,
-        'stats': STATS
-    })
+    Flask (BadRequest) et l'ASGI (json.JSONDecodeError) signalent tous deux un
+    corps invalide par ValueError. Le dépassement de taille (413) remonte tel
+    quel vers le gestionnaire d'erreurs du serveur.
+    """
+    try:
+        return load_data()
+    except RequestEntityTooLarge:
+        raise
+    except BadRequest as e:
+        raise ValueError(e.description)
 
-@app.route('/analyze', methods=['POST'])
-def analyze_window():
-    """Analyse d'une fenêtre à partir d'une image"""
+INVALID_JSON_RESPONSE = {
+    'success': False,
+    'error': 'Invalid JSON',
+    'message': 'Le corps de la requête n\'est pas un JSON valide'
+}
+
+def run_analysis(load_data, timer=None):
+    """Analyse d'une image, retourne (réponse, code HTTP)
+
+    ``load_data`` est appelé pour obtenir le JSON de la requête afin que les
+    erreurs de décodage soient comptabilisées comme des échecs d'analyse.
+    ``timer`` (StageTimer) mesure chaque étape du traitement.
+    """
     start_time = time.time()
+    timer = timer or StageTimer()
     STATS['total_analyses'] += 1
     
     try:
         # Récupérer les données JSON
-        data = request.get_json()
+        with timer.stage('parse'):
+            try:
+                data = parse_json_body(load_data)
+            except ValueError:
+                STATS['failed_analyses'] += 1
+                return dict(INVALID_JSON_RESPONSE), 400
         
         if not data or 'image' not in data:
             STATS['failed_analyses'] += 1
-            return jsonify({
+            return {
                 'success': False,
                 'error': 'Image data required',
                 'message': 'Veuillez fournir une image en base64'
-            }), 400
+            }, 400
         
         logger.info("🔍 Début analyse d'image")
         
         # Préprocesser l'image
-        image_array, image_pil = preprocess_image(data['image'])
+        with timer.stage('decode'):
+            image_array, image_pil = preprocess_image(data['image'])
         
         if image_array is None:
             STATS['failed_analyses'] += 1
-            return jsonify({
+            return {
                 'success': False,
                 'error': 'Image preprocessing failed',
                 'message': 'Impossible de traiter l\'image fournie'
-            }), 400
-        
-        # Tentative d'analyse avec TensorFlow
-        detection_result = analyze_window_tensorflow(image_array)
+            }, 400
         
-        # Fallback OpenCV si TensorFlow échoue
-        if detection_result is None and image_pil is not None:
-            detection_result = analyze_window_opencv(image_pil)
-        
-        # Fallback simulation si tout échoue
-        if detection_result is None:
-            detection_result = analyze_window_fallback()
+        with timer.stage('detection'):
+            # Tentative d'analyse avec TensorFlow
+            detection_result = analyze_window_tensorflow(image_array)
+            
+            # Fallback OpenCV si TensorFlow échoue
+            if detection_result is None and image_pil is not None:
+                detection_result = analyze_window_opencv(image_pil)
+            
+            # Fallback simulation si tout échoue
+            if detection_result is None:
+                detection_result = analyze_window_fallback()
         
         # Générer l'analyse complète
-        analysis = generate_window_analysis(detection_result)
+        with timer.stage('analysis'):
+            analysis = generate_window_analysis(detection_result)
         
         # Ajouter les métadonnées de traitement
         processing_time = (time.time() - start_time) * 1000
@@ -337,39 +391,86 @@ def analyze_window():
             STATS['failed_analyses'] += 1
             logger.warning("⚠️ Aucune fenêtre détectée")
         
-        return jsonify(analysis)
+        return analysis, 200
         
+    except RequestEntityTooLarge:
+        STATS['failed_analyses'] += 1
+        raise
     except Exception as e:
         STATS['failed_analyses'] += 1
         logger.error(f"❌ Erreur analyse: {e}")
-        return jsonify({
+        return {
             'success': False,
             'error': str(e),
             'message': 'Erreur interne du serveur',
             'processing_time_ms': (time.time() - start_time) * 1000
-        }), 500
+        }, 500
 
-@app.route('/batch-analyze', methods=['POST'])
-def batch_analyze():
-    """Analyse en lot de plusieurs images"""
+def run_profiled_analysis(load_data, headers, args):
+    """Analyse avec profilage optionnel (en-tête X-Profile ou échantillonnage)"""
+    arrival_time = time.time()
     try:
-        data = request.get_json()
+        profiler = requested_profiler(headers, args)
+    except PermissionError as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': 'Jeton administrateur requis pour le profilage'
+        }, 403
+    
+    timer = StageTimer()
+    
+    # Capture du trafic : on garde l'image reçue pour la rejouer plus tard
+    captured = {}
+    if capture_recorder is not None and capture_recorder.should_capture():
+        def load_and_capture():
+            data = load_data()
+            captured['image'] = data.get('image') if isinstance(data, dict) else None
+            return data
+        analysis_loader = load_and_capture
+    else:
+        analysis_loader = load_data
+    
+    if profiler is None:
+        payload, status = run_analysis(analysis_loader, timer)
+    else:
+        with profiler:
+            payload, status = run_analysis(analysis_loader, timer)
+        profiler.finish(payload, timer)
+    
+    memory_peaks = timer.memory_peaks()
+    if memory_peaks:
+        memory_stats.add(timer.stages)
+        payload['memory'] = {'peak_alloc_kb': memory_peaks}
+    
+    if captured:
+        capture_recorder.record(captured['image'], arrival_time, status, payload, timer.as_dict())
+    
+    return payload, status
+
+def run_batch_analysis(load_data):
+    """Analyse en lot, retourne (réponse, code HTTP)"""
+    try:
+        try:
+            data = parse_json_body(load_data)
+        except ValueError:
+            return dict(INVALID_JSON_RESPONSE), 400
         
         if not data or 'images' not in data:
-            return jsonify({
+            return {
                 'success': False,
                 'error': 'Images array required'
-            }), 400
+            }, 400
         
         images = data['images']
-        results = []
+        detections = []
         
         logger.info(f"🔍 Début analyse en lot de {len(images)} images")
         
         for i, image_data in enumerate(images):
             logger.info(f"Analyse image {i+1}/{len(images)}")
             
-            # Analyser chaque image individuellement
+            # Détection image par image, post-traitement groupé ensuite
             image_array, image_pil = preprocess_image(image_data)
             
             if image_array is not None:
@@ -378,18 +479,26 @@ def batch_analyze():
                     detection_result = analyze_window_opencv(image_pil)
                 if detection_result is None:
                     detection_result = analyze_window_fallback()
-                
-                analysis = generate_window_analysis(detection_result)
-                results.append(analysis)
+                detections.append(detection_result)
             else:
-                results.append({
-                    'success': False,
-                    'error': 'Image preprocessing failed'
-                })
+                detections.append(None)
+        
+        # Analyses construites en une passe vectorisée
+        analyses = iter(ApiDetectionBatch(
+            [d for d in detections if d is not None]
+        ).to_dicts(KIT_FEATURES, BACKEND_VERSION))
+        
+        results = [
+            next(analyses) if detection_result is not None else {
+                'success': False,
+                'error': 'Image preprocessing failed'
+            }
+            for detection_result in detections
+        ]
         
         successful = sum(1 for r in results if r.get('success', False))
         
-        return jsonify({
+        return {
             'success': True,
             'results': results,
             'summary': {
@@ -397,18 +506,100 @@ def batch_analyze():
                 'successful': successful,
                 'failed': len(images) - successful
             }
-        })
+        }, 200
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         logger.error(f"❌ Erreur batch analyse: {e}")
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500
 
-@app.route('/model-info', methods=['GET'])
-def model_info():
-    """Informations sur les modèles et capacités"""
+def analyze_image_bytes(image_bytes):
+    """Analyse d'une entrée d'un lot en flux (octets bruts de l'image)"""
+    image_array, image_pil = preprocess_image_bytes(image_bytes)
+    if image_array is None:
+        return {
+            'success': False,
+            'error': 'Image preprocessing failed'
+        }
+    
+    detection_result = analyze_window_tensorflow(image_array)
+    if detection_result is None and image_pil is not None:
+        detection_result = analyze_window_opencv(image_pil)
+    if detection_result is None:
+        detection_result = analyze_window_fallback()
+    
+    return ApiDetectionBatch([detection_result]).to_dicts(KIT_FEATURES, BACKEND_VERSION)[0]
+
+def run_stream_analysis(mimetype, mimetype_params, stream):
+    """Analyse en lot d'une archive tar/zip ou d'un envoi multipart
+
+    Retourne (générateur NDJSON, 200) ou (réponse d'erreur, code HTTP).
+    Une ligne par entrée dans l'ordre de l'archive, puis une ligne de résumé.
+    """
+    try:
+        entries = open_entries(mimetype, mimetype_params, stream, STREAM_MAX_ENTRY_BYTES)
+    except StreamFormatError as e:
+        return {'success': False, 'error': str(e)}, 400
+    
+    if entries is None:
+        return {
+            'success': False,
+            'error': 'Unsupported media type',
+            'message': 'Envoyer une archive tar/zip ou un formulaire multipart'
+        }, 415
+    
+    def generate():
+        start_time = time.time()
+        total = successful = 0
+        error = None
+        
+        logger.info(f"🔍 Début analyse en flux ({mimetype})")
+        try:
+            for result in stream_analyze(entries, analyze_image_bytes, stream_executor, STREAM_WINDOW):
+                total += 1
+                successful += result.get('success', False)
+                yield encode_json(result) + b'\n'
+        except StreamFormatError as e:
+            error = str(e)
+            logger.error(f"❌ Flux invalide après {total} entrées: {e}")
+        except Exception as e:
+            # Les en-têtes sont déjà envoyés : l'erreur passe dans le résumé
+            error = str(e)
+            logger.error(f"❌ Erreur analyse en flux après {total} entrées: {e}")
+        
+        summary = {
+            'success': error is None,
+            'summary': {
+                'total': total,
+                'successful': successful,
+                'failed': total - successful
+            },
+            'processing_time_ms': round((time.time() - start_time) * 1000, 2)
+        }
+        if error is not None:
+            summary['error'] = error
+        yield encode_json(summary) + b'\n'
+    
+    return generate(), 200
+
+def build_health():
+    """Contenu de la réponse de santé"""
+    return {
+        'status': 'draining' if recycler.draining else 'healthy',
+        'service': 'BreezeFrame Python Backend',
+        'version': BACKEND_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'tensorflow_available': TENSORFLOW_AVAILABLE,
+        'opencv_available': OPENCV_AVAILABLE,
+        'stats': STATS
+    }
+
+def build_model_info():
+    """Informations sur les modèles, retourne (réponse, code HTTP)"""
     try:
         info = {
             'tensorflow': {
@@ -429,20 +620,23 @@ def model_info():
             'max_image_size': '16MB'
         }
         
-        return jsonify({
+        window_analyzer = get_window_analyzer()
+        info['model_version'] = window_analyzer.model_version if window_analyzer is not None else None
+        info['model_versions'] = window_analyzer.models.status() if window_analyzer is not None else None
+        
+        return {
             'success': True,
             'model_info': info
-        })
+        }, 200
         
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500
 
-@app.route('/stats', methods=['GET'])
-def get_stats():
-    """Statistiques du serveur"""
+def build_stats():
+    """Statistiques du serveur, retourne (réponse, code HTTP)"""
     try:
         uptime = datetime.now() - datetime.fromisoformat(STATS['start_time'])
         
@@ -452,24 +646,24 @@ def get_stats():
             'uptime_human': str(uptime).split('.')[0],
             'success_rate': round(
                 (STATS['successful_analyses'] / max(STATS['total_analyses'], 1)) * 100, 2
-            )
+            ),
+            'traffic_capture': capture_recorder.stats() if capture_recorder else None,
+            'memory': memory_report()
         }
         
-        return jsonify({
+        return {
             'success': True,
             'stats': stats_response
-        })
+        }, 200
         
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500
 
-@app.route('/reset-stats', methods=['POST'])
-def reset_stats():
-    """Réinitialiser les statistiques"""
-    global STATS
+def reset_stats_counters():
+    """Remet à zéro les compteurs globaux"""
     STATS.update({
         'total_analyses': 0,
         'successful_analyses': 0,
@@ -477,10 +671,198 @@ def reset_stats():
         'start_time': datetime.now().isoformat()
     })
     
-    return jsonify({
+    return {
         'success': True,
         'message': 'Statistiques réinitialisées'
-    })
+    }
+
+def respond(payload, status=200):
+    """Encode la réponse selon l'en-tête Accept et le paramètre fields="""
+    body, content_type = encode_response(
+        payload,
+        request.headers.get('Accept'),
+        request.args.get('fields')
+    )
+    response = Response(body, status=status, content_type=content_type)
+    response.vary.add('Accept')
+    return response
+
+def load_window_analyzer():
+    """Charge le WindowAnalyzer partagé au démarrage du serveur
+
+    L'import construit le modèle TensorFlow (et ses répliques) : il se fait au
+    lancement, pas dans le thread d'une requête. Les routes d'analyse gardent
+    leurs propres détecteurs ; l'analyseur sert au remplacement à chaud
+    (/admin/model) et aux outils qui l'utilisent (bulk_analyze).
+    """
+    global WINDOW_ANALYZER
+    if not TENSORFLOW_AVAILABLE:
+        return None
+    try:
+        from window_analyzer import analyzer
+    except Exception as e:
+        logger.warning(f"⚠️ Analyseur de fenêtres non chargé: {e}")
+        return None
+    WINDOW_ANALYZER = analyzer
+    logger.info(f"🧠 Modèle de détection chargé: {analyzer.model_version}")
+    return analyzer
+
+def get_window_analyzer():
+    """WindowAnalyzer partagé, ou None s'il n'a pas été chargé au démarrage"""
+    return WINDOW_ANALYZER
+
+def build_model_admin(token, load_data=None):
+    """État / remplacement à chaud / retour arrière du modèle (admin)
+
+    Sans corps : état des versions. Corps JSON :
+    {"action": "load", "path": "models/v2.keras", "variant": "float32", "version": "v2"}
+    {"action": "rollback"}
+    """
+    if not is_admin(token):
+        return {
+            'success': False,
+            'error': 'Admin token required',
+            'message': 'Jeton administrateur requis'
+        }, 403
+    
+    window_analyzer = get_window_analyzer()
+    if window_analyzer is None:
+        return {
+            'success': False,
+            'error': 'Model not loaded',
+            'message': 'Analyseur TensorFlow non chargé au démarrage'
+        }, 503
+    
+    if load_data is None:
+        return {'success': True, 'models': window_analyzer.models.status()}, 200
+    
+    data = load_data() or {}
+    action = data.get('action')
+    try:
+        if action == 'load':
+            from window_analyzer import MODEL_PATH
+            path = data.get('path') or ''
+            # Seuls les fichiers du dossier des modèles sont chargeables
+            model_dir = os.path.realpath(os.path.dirname(MODEL_PATH) or '.')
+            if not os.path.realpath(path).startswith(model_dir + os.sep) or not os.path.isfile(path):
+                return {
+                    'success': False,
+                    'error': 'Invalid model path',
+                    'message': f'Fichier de modèle introuvable dans {model_dir}'
+                }, 400
+            job = window_analyzer.swap_model(path, data.get('variant'), data.get('version'))
+            return {'success': True, 'swap': job}, 202
+        
+        if action == 'rollback':
+            return {'success': True, 'active': window_analyzer.rollback_model()}, 200
+    except RuntimeError as e:
+        return {'success': False, 'error': str(e)}, 409
+    except LookupError as e:
+        return {'success': False, 'error': str(e)}, 404
+    
+    return {
+        'success': False,
+        'error': 'Unknown action',
+        'message': 'Actions disponibles : load, rollback'
+    }, 400
+
+def build_memory_diagnostics(token, action):
+    """Instantané ou diff tracemalloc (admin), retourne (réponse, code HTTP)"""
+    if not is_admin(token):
+        return {
+            'success': False,
+            'error': 'Admin token required',
+            'message': 'Jeton administrateur requis'
+        }, 403
+    
+    if action == 'diff':
+        diff = snapshots.diff()
+        if diff is None:
+            return {
+                'success': False,
+                'error': 'No baseline snapshot',
+                'message': 'Prendre d\'abord un instantané (action=snapshot)'
+            }, 409
+        return {'success': True, 'diff': diff, 'memory': memory_report()}, 200
+    
+    return {'success': True, 'snapshot': snapshots.snapshot(), 'memory': memory_report()}, 200
+
+# Routes API
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """Vérification de santé du serveur"""
+    return respond(build_health())
+
+@app.route('/analyze', methods=['POST'])
+def analyze_window():
+    """Analyse d'une fenêtre à partir d'une image"""
+    payload, status = run_profiled_analysis(request.get_json, request.headers, request.args)
+    return respond(payload, status)
+
+@app.route('/batch-analyze', methods=['POST'])
+def batch_analyze():
+    """Analyse en lot de plusieurs images"""
+    payload, status = run_batch_analysis(request.get_json)
+    return respond(payload, status)
+
+@app.route('/batch-analyze/stream', methods=['POST'])
+def batch_analyze_stream():
+    """Analyse en lot d'une archive ou d'un envoi multipart, lu en flux
+
+    Le corps n'est pas soumis à MAX_CONTENT_LENGTH : seule chaque entrée est
+    limitée (STREAM_MAX_ENTRY_BYTES). Réponse NDJSON émise au fil de l'eau.
+    """
+    stream = get_input_stream(request.environ, max_content_length=None)
+    result, status = run_stream_analysis(request.mimetype, request.mimetype_params, stream)
+    if status != 200:
+        return respond(result, status)
+    return Response(stream_with_context(result), mimetype='application/x-ndjson')
+
+@app.route('/model-info', methods=['GET'])
+def model_info():
+    """Informations sur les modèles et capacités"""
+    payload, status = build_model_info()
+    return respond(payload, status)
+
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    """Statistiques du serveur"""
+    payload, status = build_stats()
+    return respond(payload, status)
+
+@app.route('/admin/memory', methods=['GET'])
+def memory_diagnostics():
+    """Instantané / diff tracemalloc (action=snapshot|diff)"""
+    payload, status = build_memory_diagnostics(
+        request.headers.get('X-Admin-Token'),
+        request.args.get('action', 'snapshot')
+    )
+    return respond(payload, status)
+
+@app.route('/admin/model', methods=['GET', 'POST'])
+def model_admin():
+    """Remplacement à chaud du modèle (POST action=load|rollback) et état des versions"""
+    payload, status = build_model_admin(
+        request.headers.get('X-Admin-Token'),
+        request.get_json if request.method == 'POST' else None
+    )
+    return respond(payload, status)
+
+@app.route('/reset-stats', methods=['POST'])
+def reset_stats():
+    """Réinitialiser les statistiques"""
+    return respond(reset_stats_counters())
+
+# Suivi des requêtes en cours (recyclage du worker)
+
+@app.before_request
+def track_request_start():
+    recycler.request_started()
+
+@app.teardown_request
+def track_request_end(error=None):
+    recycler.request_finished()
 
 # Gestion des erreurs
 
@@ -528,6 +910,10 @@ if __name__ == '__main__':
     logger.info("  GET  /stats           - Statistiques")
     logger.info("=" * 50)
     
+    # Avec le rechargeur (debug), seul le processus qui sert les requêtes charge le modèle
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        load_window_analyzer()
+    
     try:
         app.run(
             host='0.0.0.0',
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+BreezeFrame Python Backend - Mode ASGI
+Sert les mêmes routes que app.py sur une boucle asyncio
+
+Les entrées/sorties réseau (lecture du corps de requête, envoi de la
+réponse) restent sur la boucle d'événements ; le décodage et l'inférence,
+liés au CPU, sont envoyés vers un pool de threads borné. Des milliers de
+clients lents peuvent ainsi partager un petit pool de calcul.
+
+Lancement : uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import ClientDisconnect
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from werkzeug.http import parse_options_header
+
+from app import (
+    CORS_ORIGINS,
+    MAX_CONTENT_LENGTH,
+    build_health,
+    build_memory_diagnostics,
+    build_model_admin,
+    build_model_info,
+    build_stats,
+    load_window_analyzer,
+    reset_stats_counters,
+    run_batch_analysis,
+    run_profiled_analysis,
+    run_stream_analysis,
+)
+from memory_monitor import recycler
+from serialization import encode_response
+
+logger = logging.getLogger(__name__)
+
+# Configuration du pool de calcul
+COMPUTE_WORKERS = int(os.environ.get('ASGI_COMPUTE_WORKERS', os.cpu_count() or 2))
+MAX_PENDING_JOBS = int(os.environ.get('ASGI_MAX_PENDING_JOBS', COMPUTE_WORKERS * 4))
+
+compute_executor = ThreadPoolExecutor(
+    max_workers=COMPUTE_WORKERS,
+    thread_name_prefix='breezeframe-compute'
+)
+
+# Limite le nombre de tâches en attente du pool (créé à la première requête,
+# une fois la boucle d'événements démarrée)
+_pending_jobs = None
+
+class PayloadTooLarge(Exception):
+    """Corps de requête au-delà de MAX_CONTENT_LENGTH"""
+
+async def run_compute(func, *args):
+    """Exécute une fonction CPU dans le pool borné"""
+    global _pending_jobs
+    if _pending_jobs is None:
+        _pending_jobs = asyncio.Semaphore(MAX_PENDING_JOBS)
+
+    async with _pending_jobs:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(compute_executor, func, *args)
+
+async def read_body(request):
+    """Lit le corps de la requête sur la boucle en respectant la taille max"""
+    content_length = request.headers.get('content-length')
+    if content_length and int(content_length) > MAX_CONTENT_LENGTH:
+        raise PayloadTooLarge()
+
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_CONTENT_LENGTH:
+            raise PayloadTooLarge()
+        chunks.append(chunk)
+
+    return b''.join(chunks)
+
+class RequestBodyReader:
+    """Corps de requête lu comme un fichier bloquant depuis le pool de calcul
+
+    Chaque read() demande les morceaux suivants à la boucle d'événements : le
+    corps n'est reçu qu'au rythme où les entrées de l'archive sont analysées.
+    """
+
+    def __init__(self, request, loop):
+        self.chunks = request.stream()
+        self.loop = loop
+        self.buffer = bytearray()
+        self.eof = False
+
+    async def _next_chunk(self):
+        try:
+            return await self.chunks.__anext__()
+        except StopAsyncIteration:
+            return b''
+
+    def read(self, size=-1):
+        while not self.eof and (size is None or size < 0 or len(self.buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self.loop).result()
+            if chunk:
+                self.buffer += chunk
+            else:
+                self.eof = True
+
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+def json_loader(body):
+    """Équivalent de request.get_json pour un corps déjà lu"""
+    return lambda: json.loads(body)
+
+def encoded(request, payload, status=200):
+    """Encode selon l'en-tête Accept et le paramètre fields="""
+    body, content_type = encode_response(
+        payload,
+        request.headers.get('accept'),
+        request.query_params.get('fields')
+    )
+    return Response(body, status_code=status, media_type=content_type, headers={'Vary': 'Accept'})
+
+def handle_and_encode(handler, load_data, accept_header, fields_param):
+    """Traitement et encodage, exécutés ensemble dans le pool de calcul"""
+    payload, status = handler(load_data)
+    body, content_type = encode_response(payload, accept_header, fields_param)
+    return body, content_type, status
+
+async def compute_route(request, handler):
+    """Lit le corps puis délègue le traitement au pool de calcul"""
+    try:
+        body = await read_body(request)
+    except PayloadTooLarge:
+        return too_large()
+    except ClientDisconnect:
+        logger.warning("⚠️ Client déconnecté pendant l'envoi")
+        return JSONResponse({'success': False, 'error': 'Client disconnected'}, status_code=400)
+
+    body, content_type, status = await run_compute(
+        handle_and_encode,
+        handler,
+        json_loader(body),
+        request.headers.get('accept'),
+        request.query_params.get('fields')
+    )
+    return Response(body, status_code=status, media_type=content_type, headers={'Vary': 'Accept'})
+
+# Routes API
+
+async def health_check(request):
+    """Vérification de santé du serveur"""
+    return encoded(request, build_health())
+
+async def analyze_window(request):
+    """Analyse d'une fenêtre à partir d'une image"""
+    return await compute_route(
+        request,
+        lambda load_data: run_profiled_analysis(load_data, request.headers, request.query_params)
+    )
+
+async def batch_analyze(request):
+    """Analyse en lot de plusieurs images"""
+    return await compute_route(request, run_batch_analysis)
+
+async def batch_analyze_stream(request):
+    """Analyse en lot d'une archive ou d'un envoi multipart, lu en flux
+
+    Le corps est lu morceau par morceau depuis le pool de calcul (voir
+    RequestBodyReader) ; chaque ligne NDJSON est produite dans ce pool.
+    """
+    mimetype, params = parse_options_header(request.headers.get('content-type', ''))
+    stream = RequestBodyReader(request, asyncio.get_running_loop())
+    result, status = await run_compute(run_stream_analysis, mimetype.lower(), params, stream)
+    if status != 200:
+        return encoded(request, result, status)
+
+    async def lines():
+        try:
+            while True:
+                line = await run_compute(next, result, None)
+                if line is None:
+                    break
+                yield line
+        finally:
+            # Client parti en cours de réponse : arrête l'analyse
+            with contextlib.suppress(ValueError):
+                result.close()
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+async def model_info(request):
+    """Informations sur les modèles et capacités"""
+    payload, status = build_model_info()
+    return encoded(request, payload, status)
+
+async def get_stats(request):
+    """Statistiques du serveur"""
+    payload, status = build_stats()
+    return encoded(request, payload, status)
+
+async def memory_diagnostics(request):
+    """Instantané / diff tracemalloc (action=snapshot|diff)"""
+    payload, status = await run_compute(
+        build_memory_diagnostics,
+        request.headers.get('x-admin-token'),
+        request.query_params.get('action', 'snapshot')
+    )
+    return encoded(request, payload, status)
+
+async def model_admin(request):
+    """Remplacement à chaud du modèle (POST action=load|rollback) et état des versions"""
+    load_data = None
+    if request.method == 'POST':
+        try:
+            load_data = json_loader(await read_body(request))
+        except PayloadTooLarge:
+            return too_large()
+    payload, status = await run_compute(build_model_admin, request.headers.get('x-admin-token'), load_data)
+    return encoded(request, payload, status)
+
+async def reset_stats(request):
+    """Réinitialiser les statistiques"""
+    return encoded(request, reset_stats_counters())
+
+# Gestion des erreurs
+
+async def not_found(request, exc):
+    return JSONResponse({
+        'success': False,
+        'error': 'Endpoint not found',
+        'message': 'L\'endpoint demandé n\'existe pas'
+    }, status_code=404)
+
+def too_large():
+    return JSONResponse({
+        'success': False,
+        'error': 'File too large',
+        'message': 'L\'image est trop volumineuse (max 16MB)'
+    }, status_code=413)
+
+async def internal_error(request, exc):
+    return JSONResponse({
+        'success': False,
+        'error': 'Internal server error',
+        'message': 'Erreur interne du serveur'
+    }, status_code=500)
+
+class RequestTrackingMiddleware:
+    """Compte les requêtes en cours pour le recyclage du worker"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        recycler.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            recycler.request_finished()
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    await run_compute(load_window_analyzer)
+    yield
+    compute_executor.shutdown(wait=True)
+
+app = Starlette(
+    routes=[
+        Route('/health', health_check, methods=['GET']),
+        Route('/analyze', analyze_window, methods=['POST']),
+        Route('/batch-analyze', batch_analyze, methods=['POST']),
+        Route('/batch-analyze/stream', batch_analyze_stream, methods=['POST']),
+        Route('/model-info', model_info, methods=['GET']),
+        Route('/stats', get_stats, methods=['GET']),
+        Route('/admin/memory', memory_diagnostics, methods=['GET']),
+        Route('/admin/model', model_admin, methods=['GET', 'POST']),
+        Route('/reset-stats', reset_stats, methods=['POST']),
+    ],
+    middleware=[
+        Middleware(RequestTrackingMiddleware),
+        Middleware(CORSMiddleware, allow_origins=CORS_ORIGINS, allow_methods=['*'], allow_headers=['*'])
+    ],
+    exception_handlers={
+        404: not_found,
+        500: internal_error
+    },
+    lifespan=lifespan
+)
+
+# Point d'entrée principal
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 5000))
+
+    logger.info("🚀 Démarrage BreezeFrame Python Backend (ASGI)")
+    logger.info(f"📡 Port: {port}")
+    logger.info(f"⚙️ Pool de calcul: {COMPUTE_WORKERS} threads, {MAX_PENDING_JOBS} tâches en attente max")
+
+    uvicorn.run(app, host='0.0.0.0', port=port)
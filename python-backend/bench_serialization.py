@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+BreezeFrame - Benchmark de sérialisation
+Compare jsonify (encodeur stdlib de Flask) au chemin rapide de serialization.py
+sur une réponse de lot de 500 images.
+
+Usage : python bench_serialization.py [--images 500] [--repeat 20]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app import app, generate_window_analysis
+from serialization import (
+    MSGPACK_AVAILABLE,
+    ORJSON_AVAILABLE,
+    encode_response,
+)
+
+def build_batch_payload(count):
+    """Réponse /batch-analyze factice de ``count`` images"""
+    rng = np.random.default_rng(42)
+    results = []
+    for _ in range(count):
+        confidence = rng.uniform(0.7, 0.95)
+        results.append(generate_window_analysis({
+            'method': 'tensorflow',
+            'confidence': float(confidence),
+            'bounding_box': {
+                'x': float(rng.uniform(0.1, 0.3)),
+                'y': float(rng.uniform(0.1, 0.3)),
+                'width': float(rng.uniform(0.4, 0.6)),
+                'height': float(rng.uniform(0.4, 0.6))
+            },
+            'window_detected': True
+        }))
+
+    return {
+        'success': True,
+        'results': results,
+        'summary': {'total': count, 'successful': count, 'failed': 0}
+    }
+
+def measure(label, encode, repeat):
+    """Temps moyen d'encodage (ms) et taille du corps (octets)"""
+    body = encode()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<44} {elapsed_ms:8.2f} ms  {len(body):>9} octets")
+    return elapsed_ms, len(body)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de sérialisation des réponses")
+    parser.add_argument('--images', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_batch_payload(args.images)
+
+    print(f"📊 Sérialisation d'un lot de {args.images} images ({args.repeat} répétitions)")
+    print(f"  orjson: {'✅' if ORJSON_AVAILABLE else '❌'}  msgpack: {'✅' if MSGPACK_AVAILABLE else '❌'}")
+
+    with app.app_context():
+        measure('jsonify (référence)', lambda: app.json.response(payload).get_data(), args.repeat)
+
+    measure('JSON rapide', lambda: encode_response(payload)[0], args.repeat)
+
+    if MSGPACK_AVAILABLE:
+        measure('MessagePack', lambda: encode_response(payload, 'application/msgpack')[0], args.repeat)
+
+    measure(
+        'JSON fields=dimensions,kit_recommendation',
+        lambda: encode_response(payload, None, 'dimensions,kit_recommendation')[0],
+        args.repeat
+    )
+
+    if MSGPACK_AVAILABLE:
+        measure(
+            'MessagePack + fields',
+            lambda: encode_response(payload, 'application/msgpack', 'dimensions,kit_recommendation')[0],
+            args.repeat
+        )
+
+if __name__ == '__main__':
+    main()
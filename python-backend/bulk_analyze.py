@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+BreezeFrame Bulk Analyzer
+Analyse hors-ligne d'un dossier, d'un motif glob ou d'un manifeste d'images
+
+Les images sont réparties par lots sur un pool de processus ; chaque
+processus possède son propre WindowAnalyzer et utilise le chemin groupé du
+modèle (un appel predict par lot). Les résultats sont écrits en continu
+(JSONL ou Parquet) et un fichier de reprise permet de relancer une analyse
+interrompue là où elle s'est arrêtée.
+
+Exemples :
+    python bulk_analyze.py photos/ -o resultats.jsonl
+    python bulk_analyze.py "dataset/**/*.jpg" -o resultats.parquet --workers 8
+    python bulk_analyze.py --manifest images.txt -o resultats.jsonl
+"""
+
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Set
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('bulk_analyze')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+# Analyseur propre à chaque processus du pool
+_worker_analyzer = None
+
+def _init_worker():
+    """Initialise le WindowAnalyzer du processus (TensorFlow chargé une fois)"""
+    global _worker_analyzer
+    logging.getLogger().setLevel(logging.WARNING)
+    # L'import crée l'instance globale de l'analyseur
+    from window_analyzer import analyzer
+    _worker_analyzer = analyzer
+
+def _analyze_chunk(paths: List[str]) -> List[Dict]:
+    """Analyse un lot de fichiers dans un processus du pool"""
+    images = []
+    read_errors = {}
+    for i, path in enumerate(paths):
+        try:
+            with open(path, 'rb') as f:
+                images.append(f.read())
+        except OSError as e:
+            read_errors[i] = str(e)
+            images.append(b'')
+
+    results = _worker_analyzer.analyze_image_batch(images)
+
+    records = []
+    for i, (path, result) in enumerate(zip(paths, results)):
+        if i in read_errors:
+            result = {'success': False, 'error': read_errors[i]}
+        records.append({'path': path, **result})
+    return records
+
+def collect_inputs(inputs: List[str], manifest: str = None) -> List[str]:
+    """Liste les images d'entrée (dossiers, motifs glob, manifeste)"""
+    paths = []
+
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, _, files in os.walk(entry):
+                paths.extend(
+                    os.path.join(root, name) for name in files
+                    if name.lower().endswith(IMAGE_EXTENSIONS)
+                )
+        elif os.path.isfile(entry):
+            paths.append(entry)
+        else:
+            paths.extend(
+                p for p in glob.glob(entry, recursive=True)
+                if p.lower().endswith(IMAGE_EXTENSIONS)
+            )
+
+    if manifest:
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+
+    # Ordre stable et sans doublons pour que la reprise soit déterministe
+    return sorted(set(os.path.abspath(p) for p in paths))
+
+def load_checkpoint(checkpoint_path: str) -> Set[str]:
+    """Chemins déjà traités lors d'une exécution précédente"""
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+def chunked(paths: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(paths), size):
+        yield paths[start:start + size]
+
+class JsonlWriter:
+    """Écriture des résultats en JSON Lines (ajout en fin de fichier)"""
+
+    def __init__(self, output_path: str):
+        self.file = open(output_path, 'a', encoding='utf-8')
+
+    def write(self, records: List[Dict]):
+        for record in records:
+            self.file.write(json.dumps(record, ensure_ascii=False, default=str))
+            self.file.write('\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Écriture des résultats en Parquet (un fichier par lot dans un dossier)
+
+    Les colonnes principales sont aplaties ; le résultat complet est conservé
+    en JSON dans la colonne ``result_json``.
+    """
+
+    def __init__(self, output_path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.pq = pq
+        self.output_dir = output_path
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.part_index = len([f for f in os.listdir(self.output_dir) if f.endswith('.parquet')])
+
+    def write(self, records: List[Dict]):
+        rows = []
+        for record in records:
+            detection = record.get('detection') or {}
+            dimensions = detection.get('dimensions') or {}
+            rows.append({
+                'path': record['path'],
+                'success': bool(record.get('success', False)),
+                'method': detection.get('method'),
+                'confidence': detection.get('confidence'),
+                'width_cm': dimensions.get('width_cm'),
+                'height_cm': dimensions.get('height_cm'),
+                'window_type': (record.get('classification') or {}).get('window_type'),
+                'kit': (record.get('kit_recommendation') or {}).get('primary'),
+                'quality_score': record.get('quality_score'),
+                'processing_time_ms': record.get('processing_time_ms'),
+                'error': record.get('error'),
+                'result_json': json.dumps(record, ensure_ascii=False, default=str)
+            })
+
+        table = self.pa.Table.from_pylist(rows)
+        part_path = os.path.join(self.output_dir, f"part-{self.part_index:06d}.parquet")
+        self.pq.write_table(table, part_path)
+        self.part_index += 1
+
+    def close(self):
+        pass
+
+def open_writer(output_path: str, output_format: str):
+    if output_format == 'parquet':
+        return ParquetWriter(output_path)
+    return JsonlWriter(output_path)
+
+def run(paths: List[str], output_path: str, output_format: str, checkpoint_path: str,
+        workers: int, batch_size: int) -> Dict:
+    """Analyse les images en parallèle en écrivant résultats et reprise au fil de l'eau"""
+    done = load_checkpoint(checkpoint_path)
+    pending = [p for p in paths if p not in done]
+
+    logger.info(f"📂 {len(paths)} images trouvées, {len(done & set(paths))} déjà traitées, {len(pending)} à analyser")
+    if not pending:
+        return {'total': len(paths), 'processed': 0, 'successful': 0, 'failed': 0, 'images_per_second': 0.0}
+
+    writer = open_writer(output_path, output_format)
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8')
+
+    processed = successful = 0
+    start_time = time.time()
+    last_report = start_time
+
+    # Contexte spawn : TensorFlow ne supporte pas d'être hérité par fork
+    context = multiprocessing.get_context('spawn')
+    chunks = chunked(pending, batch_size)
+    max_in_flight = workers * 2
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+            in_flight = set()
+            for chunk in chunks:
+                in_flight.add(pool.submit(_analyze_chunk, chunk))
+                if len(in_flight) < max_in_flight:
+                    continue
+
+                completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    processed, successful = _record(future.result(), writer, checkpoint, processed, successful)
+
+                now = time.time()
+                if now - last_report >= 10:
+                    last_report = now
+                    rate = processed / (now - start_time)
+                    logger.info(f"📊 {processed}/{len(pending)} images - {rate:.1f} images/s")
+
+            for future in in_flight:
+                processed, successful = _record(future.result(), writer, checkpoint, processed, successful)
+    finally:
+        writer.close()
+        checkpoint.close()
+
+    elapsed = time.time() - start_time
+    return {
+        'total': len(paths),
+        'processed': processed,
+        'successful': successful,
+        'failed': processed - successful,
+        'elapsed_seconds': round(elapsed, 2),
+        'images_per_second': round(processed / elapsed, 2) if elapsed > 0 else 0.0
+    }
+
+def _record(records, writer, checkpoint, processed, successful):
+    """Écrit les résultats puis marque les chemins comme traités"""
+    writer.write(records)
+    checkpoint.write(''.join(r['path'] + '\n' for r in records))
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+    return processed + len(records), successful + sum(1 for r in records if r.get('success'))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse hors-ligne d'images de fenêtres BreezeFrame")
+    parser.add_argument('inputs', nargs='*', help="Dossiers, fichiers ou motifs glob")
+    parser.add_argument('--manifest', help="Fichier listant un chemin d'image par ligne")
+    parser.add_argument('-o', '--output', required=True, help="Fichier .jsonl ou dossier .parquet")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], help="Format de sortie (déduit de l'extension)")
+    parser.add_argument('--checkpoint', help="Fichier de reprise (défaut: <output>.checkpoint)")
+    parser.add_argument('--restart', action='store_true', help="Ignore la reprise et recommence")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Nombre de processus")
+    parser.add_argument('--batch-size', type=int, default=32, help="Images par appel au modèle")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.manifest:
+        parser.error("fournir au moins un dossier, un motif glob ou --manifest")
+
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'jsonl')
+    checkpoint_path = args.checkpoint or f"{args.output.rstrip(os.sep)}.checkpoint"
+
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    paths = collect_inputs(args.inputs, args.manifest)
+    if not paths:
+        logger.error("❌ Aucune image trouvée")
+        return 1
+
+    logger.info(f"🚀 Analyse avec {args.workers} processus, lots de {args.batch_size} images ({output_format})")
+    summary = run(paths, args.output, output_format, checkpoint_path, args.workers, args.batch_size)
+
+    logger.info(
+        f"✅ Terminé: {summary['processed']} images analysées "
+        f"({summary['successful']} réussies, {summary['failed']} échouées) - "
+        f"{summary['images_per_second']} images/s"
+    )
+    print(json.dumps(summary, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
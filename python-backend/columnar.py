@@ -0,0 +1,235 @@
+"""
+BreezeFrame Columnar Post-processing
+Post-traitement vectorisé des résultats de lot
+
+Les détections d'un lot sont rangées en colonnes NumPy (boîtes, dimensions,
+confiances) ; classification, choix du kit, surface et score de qualité sont
+calculés en une passe vectorisée. Les dictionnaires de réponse ne sont
+construits qu'à la fin, avec les mêmes valeurs que le code scalaire
+(WindowAnalyzer.classify_window_type / recommend_kit /
+calculate_quality_score et app.generate_window_analysis).
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+# Codes de catégories (WindowAnalyzer)
+RATIO_LABELS = np.array(['Square Window', 'Wide Window', 'Tall Window'], dtype=object)
+SIZE_LABELS = np.array(['Small ', 'Large ', 'Standard '], dtype=object)
+KIT_CHOICES = (
+    ('solo', ('floor',)),
+    ('building', ('floor', 'solo')),
+    ('floor', ('solo', 'building')),
+)
+
+# Codes de catégories (API app.py)
+API_WINDOW_TYPES = (
+    ('Fenêtre Haute', 'Oscillo-battant'),
+    ('Fenêtre Large', 'Coulissant'),
+    ('Fenêtre Standard', 'Battant'),
+)
+API_KITS = (
+    ('Kit Compact', '299€'),
+    ('Kit Standard', '449€'),
+    ('Kit Premium', '699€'),
+)
+
+def _column(values, dtype):
+    return np.fromiter(values, dtype=dtype)
+
+class DetectionBatch:
+    """Détections WindowAnalyzer d'un lot, en colonnes"""
+
+    def __init__(self, detections: List[Dict]):
+        self.detections = detections
+        dimensions = [d.get('dimensions', {}) if d.get('detected', False) else {} for d in detections]
+
+        self.detected = _column((d.get('detected', False) for d in detections), bool)
+        self.confidence = _column((d.get('confidence', 0.0) for d in detections), np.float64)
+        self.width_cm = _column((dim.get('width_cm', 0) for dim in dimensions), np.float64)
+        self.height_cm = _column((dim.get('height_cm', 0) for dim in dimensions), np.float64)
+
+    def classify(self):
+        """Codes ratio/taille et ratio des dimensions (classify_window_type)"""
+        width, height = self.width_cm, self.height_cm
+        has_dimensions = (width > 0) & (height > 0)
+
+        ratio = np.divide(width, height, out=np.ones_like(width), where=height > 0)
+
+        ratio_code = np.select(
+            [(ratio >= 0.8) & (ratio <= 1.2), ratio > 1.2],
+            [0, 1],
+            default=2
+        )
+        size_code = np.select(
+            [(width < 80) & (height < 100), (width > 150) | (height > 180)],
+            [0, 1],
+            default=2
+        )
+        return has_dimensions, ratio_code, size_code, ratio
+
+    def recommend_kits(self, has_dimensions, size_code):
+        """Code du kit recommandé (recommend_kit)"""
+        width, height = self.width_cm, self.height_cm
+        is_small = has_dimensions & (size_code == 0)
+        is_large = has_dimensions & (size_code == 1)
+
+        return np.select(
+            [is_small | ((width < 100) & (height < 120)), is_large | (width > 150) | (height > 180)],
+            [0, 1],
+            default=2
+        )
+
+    def quality_scores(self):
+        """Scores de qualité non arrondis (calculate_quality_score)"""
+        width, height = self.width_cm, self.height_cm
+        confidence_score = (self.confidence + self.confidence) / 2
+        dimension_bonus = np.where(
+            (width >= 50) & (width <= 200) & (height >= 60) & (height <= 250), 0.1, 0.0
+        )
+        return np.minimum(1.0, confidence_score + dimension_bonus)
+
+    def to_dicts(self, processing_time: int) -> List[Dict]:
+        """Construit les réponses d'analyse (même forme que build_analysis)"""
+        has_dimensions, ratio_code, size_code, ratio = self.classify()
+        kit_code = self.recommend_kits(has_dimensions, size_code).tolist()
+        scores = self.quality_scores().tolist()
+        detected = self.detected.tolist()
+        has_dimensions = has_dimensions.tolist()
+        window_types = (SIZE_LABELS[size_code] + RATIO_LABELS[ratio_code]).tolist()
+        ratio = ratio.tolist()
+
+        results = []
+        for i, detection in enumerate(self.detections):
+            if not detected[i]:
+                classification = {'window_type': 'unknown', 'confidence': 0.0}
+                kit_recommendation = {'primary': 'unknown', 'alternatives': [], 'confidence': 0.0}
+                quality_score = 0.0
+            else:
+                dimensions = detection.get('dimensions', {})
+                width = dimensions.get('width_cm', 0)
+                height = dimensions.get('height_cm', 0)
+                confidence = detection.get('confidence', 0.0)
+                window_type = window_types[i] if has_dimensions[i] else 'Standard Rectangle'
+
+                classification = {
+                    'window_type': window_type,
+                    'confidence': confidence,
+                    'dimensions_ratio': ratio[i]
+                }
+                primary, alternatives = KIT_CHOICES[kit_code[i]]
+                kit_recommendation = {
+                    'primary': primary,
+                    'alternatives': list(alternatives),
+                    'confidence': confidence,
+                    'reasoning': f'Basé sur les dimensions {width}x{height}cm et le type {window_type}'
+                }
+                quality_score = round(scores[i], 2)
+
+            results.append({
+                'success': True,
+                'detection': detection,
+                'classification': classification,
+                'kit_recommendation': kit_recommendation,
+                'quality_score': quality_score,
+                'processing_time_ms': processing_time,
+                'timestamp': time.time()
+            })
+
+        return results
+
+class ApiDetectionBatch:
+    """Détections de l'API (app.py) d'un lot, en colonnes"""
+
+    def __init__(self, detections: List[Dict]):
+        self.detections = detections
+        detected = [bool(d) and bool(d.get('window_detected')) for d in detections]
+        boxes = [
+            (d.get('bounding_box') or {}) if ok else {}
+            for d, ok in zip(detections, detected)
+        ]
+
+        self.detected = np.array(detected, dtype=bool)
+        self.confidence = _column(
+            ((d.get('confidence', 0) if ok else 0) for d, ok in zip(detections, detected)),
+            np.float64
+        )
+        self.width_ratio = _column((b.get('width', 0.5) for b in boxes), np.float64)
+        self.height_ratio = _column((b.get('height', 0.7) for b in boxes), np.float64)
+
+    def compute(self):
+        """Type, dimensions estimées, surface, kit et score en une passe"""
+        width_ratio, height_ratio = self.width_ratio, self.height_ratio
+
+        type_code = np.select(
+            [height_ratio > width_ratio * 1.5, width_ratio > height_ratio * 1.5],
+            [0, 1],
+            default=2
+        )
+
+        # Estimation des dimensions (en cm), troncature identique à int()
+        estimated_width = (width_ratio * 150 + 50).astype(np.int64)
+        estimated_height = (height_ratio * 180 + 60).astype(np.int64)
+        surface = estimated_width * estimated_height / 10000
+
+        kit_code = np.select([surface < 1.0, surface < 2.0], [0, 1], default=2)
+        quality_score = (self.confidence * 100).astype(np.int64)
+
+        return type_code, estimated_width, estimated_height, surface, kit_code, quality_score
+
+    def to_dicts(self, features, backend_version: str) -> List[Dict]:
+        """Construit les réponses (même forme que generate_window_analysis)"""
+        type_code, estimated_width, estimated_height, surface, kit_code, quality_score = (
+            column.tolist() for column in self.compute()
+        )
+        detected = self.detected.tolist()
+
+        results = []
+        for i, detection_result in enumerate(self.detections):
+            if not detected[i]:
+                results.append({
+                    'success': False,
+                    'message': 'Aucune fenêtre détectée',
+                    'detection': detection_result or {},
+                    'classification': None,
+                    'dimensions': None,
+                    'kit_recommendation': None,
+                    'quality_score': 0
+                })
+                continue
+
+            window_type, opening_type = API_WINDOW_TYPES[type_code[i]]
+            kit_type, kit_price = API_KITS[kit_code[i]]
+
+            results.append({
+                'success': True,
+                'detection': detection_result,
+                'classification': {
+                    'window_type': window_type,
+                    'opening_type': opening_type,
+                    'material_detected': 'PVC/Aluminium',
+                    'glazing_type': 'Double vitrage'
+                },
+                'dimensions': {
+                    'width_cm': estimated_width[i],
+                    'height_cm': estimated_height[i],
+                    'surface_m2': round(surface[i], 2),
+                    'confidence': detection_result.get('confidence', 0)
+                },
+                'kit_recommendation': {
+                    'type': kit_type,
+                    'price': kit_price,
+                    'features': features
+                },
+                'quality_score': quality_score[i],
+                'processing_info': {
+                    'method': detection_result.get('method', 'unknown'),
+                    'timestamp': datetime.now().isoformat(),
+                    'backend_version': backend_version
+                }
+            })
+
+        return results
@@ -0,0 +1,257 @@
+"""
+BreezeFrame Inference Executor
+Exécuteur d'inférence borné avec plusieurs répliques du modèle
+
+Chaque réplique est un processus dédié qui s'épingle sur un sous-ensemble de
+cœurs avec sched_setaffinity *avant* d'initialiser TensorFlow : les pools de
+threads intra/inter-op créés ensuite héritent de cette affinité et sont
+dimensionnés sur les cœurs de la réplique. Les répliques ne partagent donc
+ni pool de threads ni cœurs.
+
+Le processus est lancé comme script (``python inference_executor.py``) et non
+par multiprocessing, qui réimporterait le module principal du serveur (et
+TensorFlow) avant l'épinglage. Le modèle y est reconstruit par
+``model_factory``, qui doit être sérialisable (fonction de module,
+functools.partial...).
+
+Côté serveur, chaque réplique garde un thread d'envoi et une file d'attente
+bornée ; les requêtes vont à la réplique la moins chargée (file + calcul en
+cours).
+"""
+
+import logging
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REPLICA_STARTUP_TIMEOUT = float(os.environ.get('INFERENCE_REPLICA_STARTUP_TIMEOUT', '120'))
+
+def available_cpus() -> List[int]:
+    """Cœurs utilisables par le processus"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def partition_cpus(cpus: List[int], parts: int) -> List[Set[int]]:
+    """Découpe les cœurs en ``parts`` groupes contigus (partagés si trop peu de cœurs)"""
+    if parts >= len(cpus):
+        return [{cpus[i % len(cpus)]} for i in range(parts)]
+
+    size, extra = divmod(len(cpus), parts)
+    groups = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(set(cpus[start:end]))
+        start = end
+    return groups
+
+class ModelReplica:
+    """Une copie du modèle servie par un processus épinglé"""
+
+    def __init__(self, index: int, model_factory: Callable, cpus: Set[int], queue_size: int):
+        self.index = index
+        self.cpus = cpus
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+
+        self.process, self.connection = self._start_process(model_factory)
+        self.thread = threading.Thread(
+            target=self._run,
+            name=f'inference-replica-{index}',
+            daemon=True
+        )
+        self.thread.start()
+
+    def _start_process(self, model_factory: Callable):
+        authkey = secrets.token_bytes(32)
+        with Listener(('127.0.0.1', 0), authkey=authkey) as listener:
+            host, port = listener.address
+            process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), str(self.index), host, str(port),
+                 ','.join(str(cpu) for cpu in sorted(self.cpus))],
+                env=dict(os.environ, INFERENCE_REPLICA_AUTHKEY=authkey.hex())
+            )
+            connection = listener.accept()
+
+        connection.send(model_factory)
+        if not connection.poll(REPLICA_STARTUP_TIMEOUT):
+            process.kill()
+            raise RuntimeError(f"Réplique {self.index} non démarrée")
+        status, detail = connection.recv()
+        if status != 'ready':
+            process.wait()
+            raise RuntimeError(f"Réplique {self.index}: {detail}")
+        return process, connection
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+
+            future, batch, on_done = item
+            if not future.set_running_or_notify_cancel():
+                on_done(self)
+                continue
+
+            try:
+                self.connection.send(batch)
+                status, result, seconds = self.connection.recv()
+                self.busy_seconds += seconds
+                if status == 'ok':
+                    self.completed += 1
+                    future.set_result(result)
+                else:
+                    self.failed += 1
+                    future.set_exception(RuntimeError(result))
+            except (EOFError, OSError) as e:
+                self.failed += 1
+                future.set_exception(RuntimeError(f"Réplique {self.index} arrêtée: {e}"))
+            finally:
+                on_done(self)
+
+    def stats(self) -> Dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            'replica': self.index,
+            'pid': self.process.pid,
+            'cpus': sorted(self.cpus),
+            'queue_depth': self.queue.qsize(),
+            'in_flight': self.pending,
+            'completed': self.completed,
+            'failed': self.failed,
+            'utilisation': round(self.busy_seconds / elapsed, 4)
+        }
+
+    def shutdown(self):
+        self.queue.put(None)
+        self.thread.join()
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.connection.close()
+        self.process.wait()
+
+class InferenceExecutor:
+    """Répartit les appels predict sur N processus de répliques du modèle"""
+
+    def __init__(self, model_factory: Callable, replicas: int,
+                 queue_size: int = 32, cpus: Optional[List[int]] = None):
+        if replicas < 1:
+            raise ValueError("Au moins une réplique est nécessaire")
+
+        self.lock = threading.Lock()
+        groups = partition_cpus(cpus or available_cpus(), replicas)
+        self.replicas = []
+        try:
+            for i in range(replicas):
+                self.replicas.append(ModelReplica(i, model_factory, groups[i], queue_size))
+        except Exception:
+            self.shutdown()
+            raise
+        logger.info(f"🧠 Exécuteur d'inférence: {replicas} processus, cœurs {[sorted(g) for g in groups]}")
+
+    def _release(self, replica: ModelReplica):
+        with self.lock:
+            replica.pending -= 1
+
+    def _submit_to(self, replica: ModelReplica, batch: np.ndarray) -> Future:
+        future = Future()
+        # Bloque si la file de la réplique est pleine (contre-pression)
+        replica.queue.put((future, batch, self._release))
+        return future
+
+    def submit(self, batch: np.ndarray) -> Future:
+        """Envoie un lot à la réplique la moins chargée"""
+        with self.lock:
+            replica = min(self.replicas, key=lambda r: r.pending)
+            replica.pending += 1
+        return self._submit_to(replica, batch)
+
+    def predict(self, batch: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(batch).result(timeout=timeout)
+
+    def warm_up(self, batch: np.ndarray, runs: int):
+        """Premiers appels sur chaque réplique (traçage du graphe)"""
+        for _ in range(runs):
+            futures = []
+            for replica in self.replicas:
+                with self.lock:
+                    replica.pending += 1
+                futures.append(self._submit_to(replica, batch))
+            for future in futures:
+                future.result()
+
+    def stats(self) -> Dict:
+        return {
+            'replicas': len(self.replicas),
+            'per_replica': [r.stats() for r in self.replicas]
+        }
+
+    def shutdown(self):
+        for replica in self.replicas:
+            replica.shutdown()
+
+def serve_replica(index: int, address, cpus: Set[int]):
+    """Boucle du processus de réplique : épinglage, modèle, puis prédictions"""
+    connection = Client(address, authkey=bytes.fromhex(os.environ['INFERENCE_REPLICA_AUTHKEY']))
+
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            logger.warning(f"⚠️ Épinglage réplique {index} impossible: {e}")
+
+    try:
+        # Premier import de TensorFlow du processus : pools créés sur les cœurs épinglés
+        import tensorflow as tf
+        threads = len(cpus) if cpus else len(available_cpus())
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+        model = connection.recv()()
+    except Exception as e:
+        connection.send(('error', str(e)))
+        return
+    connection.send(('ready', None))
+
+    while True:
+        try:
+            batch = connection.recv()
+        except EOFError:
+            break
+        if batch is None:
+            break
+
+        start = time.perf_counter()
+        try:
+            result = ('ok', model.predict(batch, verbose=0))
+        except Exception as e:
+            result = ('error', str(e))
+        connection.send(result + (time.perf_counter() - start,))
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    replica_index, host, port, cpu_list = sys.argv[1:5]
+    serve_replica(
+        int(replica_index),
+        (host, int(port)),
+        {int(cpu) for cpu in cpu_list.split(',') if cpu}
+    )
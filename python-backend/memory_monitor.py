@@ -0,0 +1,218 @@
+"""
+BreezeFrame Memory Monitor
+Suivi mémoire par requête, instantanés tracemalloc et recyclage des workers
+
+- MEMORY_TRACKING=true active tracemalloc : chaque étape (decode, detection...)
+  rapporte son pic d'allocations. Le pic est global au processus ; avec des
+  requêtes concurrentes il inclut les allocations des autres threads.
+- WORKER_RECYCLE_RSS_MB=<seuil> : quand le RSS dépasse le seuil, le worker
+  cesse d'être « sain », attend la fin des requêtes en cours puis s'envoie
+  SIGTERM. À utiliser sous un gestionnaire de processus qui relance les
+  workers (gunicorn -w 4 --threads 8 app:app, uvicorn --workers N).
+"""
+
+import logging
+import os
+import signal
+import threading
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Configuration
+MEMORY_TRACKING = os.environ.get('MEMORY_TRACKING', 'false').lower() == 'true'
+TRACEMALLOC_FRAMES = int(os.environ.get('TRACEMALLOC_FRAMES', '1'))
+WORKER_RECYCLE_RSS_MB = float(os.environ.get('WORKER_RECYCLE_RSS_MB', '0'))
+SNAPSHOT_TOP_N = int(os.environ.get('MEMORY_SNAPSHOT_TOP_N', '25'))
+
+MB = 1024 * 1024
+
+if MEMORY_TRACKING and not tracemalloc.is_tracing():
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    logger.info("🧮 Suivi mémoire tracemalloc activé")
+
+def current_rss_bytes() -> int:
+    """RSS actuel du processus"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Pas de /proc : pic de RSS (ru_maxrss en Ko sous Linux)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def peak_rss_bytes() -> int:
+    """Pic de RSS depuis le démarrage du processus"""
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class StageMemory:
+    """Pic d'allocations tracemalloc pendant une étape"""
+
+    def __init__(self):
+        self.start_current = 0
+
+    def start(self):
+        self.start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+    def stop(self) -> float:
+        """Pic au-delà de l'usage de départ, en Ko"""
+        _, peak = tracemalloc.get_traced_memory()
+        return max(0, peak - self.start_current) / 1024
+
+class MemoryStats:
+    """Agrégat des pics d'allocation par étape"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+
+    def add(self, stages: dict):
+        with self.lock:
+            for name, timing in stages.items():
+                peak = timing.get('peak_alloc_kb')
+                if peak is None:
+                    continue
+                entry = self.stages.setdefault(name, {'count': 0, 'total_kb': 0.0, 'max_kb': 0.0})
+                entry['count'] += 1
+                entry['total_kb'] += peak
+                entry['max_kb'] = max(entry['max_kb'], peak)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {
+                name: {
+                    'requests': entry['count'],
+                    'mean_peak_kb': round(entry['total_kb'] / entry['count'], 1),
+                    'max_peak_kb': round(entry['max_kb'], 1)
+                }
+                for name, entry in self.stages.items()
+            }
+
+class SnapshotStore:
+    """Instantanés tracemalloc pour les diagnostics admin"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.baseline = None
+
+    @staticmethod
+    def _format(stat) -> dict:
+        frame = stat.traceback[0]
+        entry = {
+            'file': frame.filename,
+            'line': frame.lineno,
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count
+        }
+        if hasattr(stat, 'size_diff'):
+            entry['size_diff_kb'] = round(stat.size_diff / 1024, 1)
+            entry['count_diff'] = stat.count_diff
+        return entry
+
+    def snapshot(self, limit: int = SNAPSHOT_TOP_N) -> dict:
+        """Prend un instantané (qui devient la référence des diff)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            return {'tracing_started': True, 'top': []}
+
+        snapshot = tracemalloc.take_snapshot()
+        with self.lock:
+            self.baseline = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            'traced_current_mb': round(current / MB, 2),
+            'traced_peak_mb': round(peak / MB, 2),
+            'top': [self._format(s) for s in snapshot.statistics('lineno')[:limit]]
+        }
+
+    def diff(self, limit: int = SNAPSHOT_TOP_N) -> dict:
+        """Évolution des allocations depuis le dernier instantané"""
+        with self.lock:
+            baseline = self.baseline
+        if baseline is None or not tracemalloc.is_tracing():
+            return None
+
+        snapshot = tracemalloc.take_snapshot()
+        differences = snapshot.compare_to(baseline, 'lineno')
+        return {
+            'total_diff_kb': round(sum(d.size_diff for d in differences) / 1024, 1),
+            'top': [self._format(d) for d in differences[:limit]]
+        }
+
+class WorkerRecycler:
+    """Recyclage du worker au-delà d'un seuil de RSS, après vidage des requêtes"""
+
+    def __init__(self, threshold_mb: float):
+        self.threshold_bytes = threshold_mb * MB
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.draining = False
+        self.signalled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_bytes > 0
+
+    def request_started(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        if not self.enabled:
+            with self.lock:
+                self.in_flight -= 1
+            return
+
+        rss = current_rss_bytes()
+        with self.lock:
+            self.in_flight -= 1
+            if not self.draining and rss > self.threshold_bytes:
+                self.draining = True
+                logger.warning(
+                    f"♻️ RSS {rss / MB:.0f}MB > {self.threshold_bytes / MB:.0f}MB, "
+                    f"recyclage après {self.in_flight} requête(s) en cours"
+                )
+            should_exit = self.draining and self.in_flight == 0 and not self.signalled
+            if should_exit:
+                self.signalled = True
+
+        if should_exit:
+            logger.warning(f"♻️ Recyclage du worker {os.getpid()}")
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def stats(self) -> dict:
+        return {
+            'recycle_threshold_mb': self.threshold_bytes / MB if self.enabled else None,
+            'in_flight': self.in_flight,
+            'draining': self.draining
+        }
+
+memory_stats = MemoryStats()
+snapshots = SnapshotStore()
+recycler = WorkerRecycler(WORKER_RECYCLE_RSS_MB)
+
+def memory_report() -> dict:
+    """Section mémoire de /stats"""
+    report = {
+        'pid': os.getpid(),
+        'rss_mb': round(current_rss_bytes() / MB, 1),
+        'peak_rss_mb': round(peak_rss_bytes() / MB, 1),
+        'tracemalloc': tracemalloc.is_tracing(),
+        'stages': memory_stats.as_dict(),
+        **recycler.stats()
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report['traced_current_mb'] = round(current / MB, 2)
+        report['traced_peak_mb'] = round(peak / MB, 2)
+    return report
@@ -0,0 +1,190 @@
+"""
+BreezeFrame Model Swap
+Remplacement à chaud du modèle de détection, sans redémarrage
+
+Une nouvelle version est chargée et préchauffée dans un thread de fond, puis
+devient active par simple changement de référence. Chaque appel predict
+réserve la version active le temps du calcul : les requêtes en cours
+terminent sur l'ancienne version, les suivantes utilisent la nouvelle. La
+version précédente reste chargée pour permettre un retour arrière immédiat.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def source_version(path: str) -> str:
+    """Identifiant de version dérivé du fichier (nom + empreinte du contenu)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{digest.hexdigest()[:8]}"
+
+class ModelVersion:
+    """Un modèle chargé (et ses répliques éventuelles) avec son identifiant"""
+
+    def __init__(self, model, variant: str, version: str, source: Optional[str] = None, executor=None):
+        self.model = model
+        self.variant = variant
+        self.version = version
+        self.source = source
+        self.executor = executor
+        self.loaded_at = datetime.now().isoformat()
+        self.warmup_ms = None
+        self.lock = threading.Condition()
+        self.in_flight = 0
+        self.retired = False
+
+    def acquire(self) -> bool:
+        """Réserve la version pour un appel ; False si elle est retirée"""
+        with self.lock:
+            if self.retired:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+            self.lock.notify_all()
+
+    def predict(self, image_batch: np.ndarray) -> np.ndarray:
+        if self.executor is not None:
+            return self.executor.predict(image_batch)
+        return self.model.predict(image_batch, verbose=0)
+
+    def warm_up(self, runs: int):
+        """Premiers appels (traçage du graphe, allocations) hors du trafic"""
+        start = time.perf_counter()
+        batch = np.zeros((1, 224, 224, 3), dtype=np.float32)
+        if self.executor is not None:
+            self.executor.warm_up(batch, runs)
+        else:
+            for _ in range(runs):
+                self.model.predict(batch, verbose=0)
+        self.warmup_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    def retire(self):
+        """Libère les répliques une fois les appels en cours terminés"""
+        with self.lock:
+            self.retired = True
+            while self.in_flight:
+                self.lock.wait()
+        if self.executor is not None:
+            self.executor.shutdown()
+        logger.info(f"🗑️ Version de modèle libérée: {self.version}")
+
+    def info(self) -> Dict:
+        return {
+            'version': self.version,
+            'variant': self.variant,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'warmup_ms': self.warmup_ms,
+            'replicas': len(self.executor.replicas) if self.executor is not None else 0,
+            'in_flight': self.in_flight
+        }
+
+class ModelSwapper:
+    """Version active, version précédente et chargement en arrière-plan"""
+
+    def __init__(self, loader: Callable[..., ModelVersion], warmup_runs: int = 2):
+        self.loader = loader
+        self.warmup_runs = warmup_runs
+        self.lock = threading.Lock()
+        self.current: Optional[ModelVersion] = None
+        self.previous: Optional[ModelVersion] = None
+        self.job = None
+        self.thread = None
+
+    def install(self, version: ModelVersion):
+        """Version initiale (chargée au démarrage, sans préchauffage)"""
+        with self.lock:
+            self.current = version
+
+    def acquire(self) -> Optional[ModelVersion]:
+        """Version active réservée pour un appel predict"""
+        while True:
+            version = self.current
+            if version is None or version.acquire():
+                return version
+            # Retirée entre la lecture et la réservation : on relit la référence
+
+    def _activate(self, version: ModelVersion) -> Optional[ModelVersion]:
+        """Rend ``version`` active ; retourne la version devenue inutile"""
+        with self.lock:
+            dropped = self.previous
+            self.previous = self.current
+            self.current = version
+        return dropped
+
+    def start(self, path: str, variant: str, version: Optional[str] = None) -> Dict:
+        """Lance le chargement d'une nouvelle version (RuntimeError si un chargement est en cours)"""
+        with self.lock:
+            if self.job is not None and self.job['state'] in ('loading', 'warming'):
+                raise RuntimeError('Model swap already in progress')
+            self.job = {
+                'state': 'loading',
+                'path': path,
+                'variant': variant,
+                'version': version,
+                'started_at': datetime.now().isoformat(),
+                'error': None
+            }
+            job = self.job
+        self.thread = threading.Thread(target=self._run, args=(job,), name='model-swap', daemon=True)
+        self.thread.start()
+        return dict(job)
+
+    def _run(self, job: Dict):
+        try:
+            logger.info(f"📦 Chargement du modèle {job['path']} ({job['variant']})")
+            version = self.loader(job['path'], job['variant'], job['version'])
+            job['version'] = version.version
+
+            job['state'] = 'warming'
+            version.warm_up(self.warmup_runs)
+            logger.info(f"🔥 Modèle {version.version} préchauffé en {version.warmup_ms}ms")
+
+            dropped = self._activate(version)
+            job['state'] = 'active'
+            job['finished_at'] = datetime.now().isoformat()
+            logger.info(f"🔁 Modèle actif: {version.version}")
+
+            if dropped is not None:
+                dropped.retire()
+        except Exception as e:
+            job['state'] = 'failed'
+            job['error'] = str(e)
+            job['finished_at'] = datetime.now().isoformat()
+            logger.error(f"❌ Échec du remplacement de modèle: {e}")
+
+    def rollback(self) -> ModelVersion:
+        """Réactive la version précédente (LookupError s'il n'y en a pas)"""
+        with self.lock:
+            if self.job is not None and self.job['state'] in ('loading', 'warming'):
+                raise RuntimeError('Model swap in progress')
+            if self.previous is None:
+                raise LookupError('No previous model version')
+            self.current, self.previous = self.previous, self.current
+            current = self.current
+        logger.info(f"⏪ Retour au modèle {current.version}")
+        return current
+
+    def status(self) -> Dict:
+        current, previous, job = self.current, self.previous, self.job
+        return {
+            'active': current.info() if current is not None else None,
+            'previous': previous.info() if previous is not None else None,
+            'last_swap': dict(job) if job is not None else None
+        }
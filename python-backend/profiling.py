@@ -0,0 +1,167 @@
+"""
+BreezeFrame Profiling
+Profilage à la demande d'une requête /analyze et échantillonnage du trafic
+
+Activation explicite (jeton admin requis) :
+    en-tête X-Profile: response|file  ou  paramètre ?profile=response|file
+    en-tête X-Admin-Token: <BREEZEFRAME_ADMIN_TOKEN>
+
+Échantillonnage : PROFILE_SAMPLE_RATE=0.01 profile 1% des requêtes et
+enregistre les fichiers .prof dans PROFILE_DIR sans modifier la réponse.
+"""
+
+import cProfile
+import hmac
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from memory_monitor import StageMemory
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ADMIN_TOKEN = os.environ.get('BREEZEFRAME_ADMIN_TOKEN', '')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_TOP_N = int(os.environ.get('PROFILE_TOP_N', '20'))
+
+PROFILE_MODES = ('response', 'file')
+
+# Un seul profileur déterministe actif à la fois dans le processus
+_profiler_lock = threading.Lock()
+
+def is_admin(token) -> bool:
+    """Vérifie le jeton admin (désactivé si BREEZEFRAME_ADMIN_TOKEN est vide)"""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(str(token), ADMIN_TOKEN)
+
+class StageTimer:
+    """Temps mur, temps CPU et pic d'allocations (si tracemalloc) par étape"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        memory = StageMemory() if tracemalloc.is_tracing() else None
+        if memory is not None:
+            memory.start()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            timing = self.stages.setdefault(name, {'wall_ms': 0.0, 'cpu_ms': 0.0})
+            timing['wall_ms'] += (time.perf_counter() - wall_start) * 1000
+            timing['cpu_ms'] += (time.thread_time() - cpu_start) * 1000
+            if memory is not None:
+                timing['peak_alloc_kb'] = max(timing.get('peak_alloc_kb', 0.0), memory.stop())
+
+    def memory_peaks(self):
+        """Pic d'allocations par étape (Ko), vide si tracemalloc est inactif"""
+        return {
+            name: round(timing['peak_alloc_kb'], 1)
+            for name, timing in self.stages.items()
+            if 'peak_alloc_kb' in timing
+        }
+
+    def as_dict(self):
+        return {
+            name: {key: round(value, 3) for key, value in timing.items()}
+            for name, timing in self.stages.items()
+        }
+
+class RequestProfiler:
+    """Profileur cProfile pour une requête"""
+
+    def __init__(self, mode: str, sampled: bool = False):
+        self.mode = mode
+        self.sampled = sampled
+        self.active = False
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        # Les requêtes échantillonnées ne patientent jamais derrière une autre
+        self.active = _profiler_lock.acquire(blocking=not self.sampled)
+        if self.active:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.active:
+            self.profile.disable()
+            _profiler_lock.release()
+        return False
+
+    def hot_functions(self, limit: int = PROFILE_TOP_N):
+        """Fonctions les plus coûteuses (temps propre)"""
+        stats = pstats.Stats(self.profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [
+            {
+                'function': func,
+                'file': filename,
+                'line': line,
+                'calls': nc,
+                'total_ms': round(tt * 1000, 3),
+                'cumulative_ms': round(ct * 1000, 3)
+            }
+            for (filename, line, func), (cc, nc, tt, ct, callers) in rows
+        ]
+
+    def dump(self) -> str:
+        """Enregistre le profil dans PROFILE_DIR"""
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof"
+        path = os.path.join(PROFILE_DIR, filename)
+        self.profile.dump_stats(path)
+        return path
+
+    def finish(self, payload: dict, timer: StageTimer):
+        """Ajoute le profil à la réponse ou l'enregistre sur disque"""
+        if not self.active:
+            if not self.sampled:
+                payload['profile'] = {'error': 'Profileur indisponible'}
+            return
+
+        if self.sampled:
+            path = self.dump()
+            logger.info(f"📈 Requête échantillonnée profilée: {path}")
+            return
+
+        report = {'mode': self.mode, 'stages': timer.as_dict()}
+        if self.mode == 'file':
+            report['file'] = self.dump()
+        else:
+            report['hot_functions'] = self.hot_functions()
+        payload['profile'] = report
+
+def requested_profiler(headers, args):
+    """Profileur demandé pour la requête, ou None
+
+    Lève PermissionError si un profil explicite est demandé sans jeton valide.
+    """
+    mode = headers.get('X-Profile') or args.get('profile')
+    if mode:
+        mode = mode.lower()
+        if mode in ('1', 'true'):
+            mode = 'response'
+        if mode not in PROFILE_MODES:
+            return None
+        if not is_admin(headers.get('X-Admin-Token')):
+            raise PermissionError('Admin token required')
+        return RequestProfiler(mode)
+
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return RequestProfiler('file', sampled=True)
+
+    return None
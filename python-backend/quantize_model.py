@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+BreezeFrame Model Quantization
+Quantification post-entraînement int8 du modèle de détection de fenêtres
+
+Étapes :
+  1. charge le modèle float32 (MODEL_PATH), ou le crée et l'enregistre pour
+     que les deux variantes partagent les mêmes poids ;
+  2. le convertit en TFLite int8, calibré sur des images représentatives ;
+  3. compare int8 et float32 : latence, débit, taille du modèle et écart des
+     boîtes englobantes prédites.
+
+Le modèle int8 est ensuite chargé par WindowAnalyzer avec MODEL_VARIANT=int8.
+
+Usage :
+    python quantize_model.py --samples dataset/samples --report quantization_report.json
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterator, List
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from tflite_model import TFLiteModel
+from window_analyzer import INT8_MODEL_PATH, MODEL_PATH, analyzer, build_window_model
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('quantize_model')
+
+IMAGE_PATTERNS = ('*.png', '*.jpg', '*.jpeg', '*.webp')
+
+def load_sample_arrays(sample_dir: str, limit: int) -> List[np.ndarray]:
+    """Images représentatives prétraitées comme pour l'analyse (224x224, [0, 1])"""
+    paths = sorted(
+        path for pattern in IMAGE_PATTERNS
+        for path in glob.glob(os.path.join(sample_dir, '**', pattern), recursive=True)
+    )[:limit]
+
+    arrays = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                image_array, _ = analyzer.decode_image_bytes(f.read())
+            arrays.append(image_array.astype(np.float32))
+        except Exception as e:
+            logger.warning(f"⚠️ Image ignorée {path}: {e}")
+    return arrays
+
+def load_float_model(model_path: str) -> keras.Model:
+    """Modèle float32 de référence (créé et enregistré s'il n'existe pas)"""
+    if os.path.exists(model_path):
+        logger.info(f"🧠 Modèle float32 chargé: {model_path}")
+        return keras.models.load_model(model_path)
+
+    model = build_window_model()
+    os.makedirs(os.path.dirname(model_path) or '.', exist_ok=True)
+    model.save(model_path)
+    logger.info(f"🧠 Modèle float32 créé et enregistré: {model_path}")
+    return model
+
+def quantize(model: keras.Model, samples: List[np.ndarray], output_path: str) -> str:
+    """Conversion TFLite int8 calibrée sur les images représentatives"""
+
+    def representative_dataset() -> Iterator[List[np.ndarray]]:
+        for sample in samples:
+            yield [np.expand_dims(sample, axis=0)]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    # Entrées/sorties float32 : le modèle reste interchangeable avec Keras
+    converter.inference_input_type = tf.float32
+    converter.inference_output_type = tf.float32
+
+    tflite_model = converter.convert()
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+    logger.info(f"✅ Modèle int8 enregistré: {output_path}")
+    return output_path
+
+def benchmark(predict, samples: List[np.ndarray], warmup: int = 3) -> Dict:
+    """Latence par image (batch de 1) et débit"""
+    for sample in samples[:warmup]:
+        predict(np.expand_dims(sample, axis=0))
+
+    latencies = []
+    outputs = []
+    start = time.perf_counter()
+    for sample in samples:
+        t0 = time.perf_counter()
+        outputs.append(predict(np.expand_dims(sample, axis=0))[0])
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'latency_ms': {
+            'mean': round(float(np.mean(latencies)), 3),
+            'p50': round(float(np.percentile(latencies, 50)), 3),
+            'p95': round(float(np.percentile(latencies, 95)), 3)
+        },
+        'throughput_images_per_s': round(len(samples) / elapsed, 2),
+        'outputs': np.stack(outputs)
+    }
+
+def compare(model_path: str, int8_path: str, samples: List[np.ndarray]) -> Dict:
+    """Rapport de comparaison int8 / float32"""
+    float_model = keras.models.load_model(model_path)
+    int8_model = TFLiteModel(int8_path)
+
+    # Appel direct du modèle : predict() ajoute un surcoût fixe par appel
+    float_results = benchmark(lambda batch: float_model(batch, training=False).numpy(), samples)
+    int8_results = benchmark(int8_model.predict, samples)
+
+    # Écart des boîtes (x, y, width, height), normalisé puis en pixels 224x224
+    deviation = np.abs(float_results.pop('outputs') - int8_results.pop('outputs'))
+    float_size = os.path.getsize(model_path)
+    int8_size = int8_model.size_bytes()
+
+    return {
+        'samples': len(samples),
+        'float32': {**float_results, 'model_size_bytes': float_size},
+        'int8': {**int8_results, 'model_size_bytes': int8_size},
+        'size_ratio': round(int8_size / float_size, 4),
+        'speedup': round(float_results['latency_ms']['mean'] / max(int8_results['latency_ms']['mean'], 1e-9), 3),
+        'bbox_deviation': {
+            'mean_abs': round(float(deviation.mean()), 5),
+            'max_abs': round(float(deviation.max()), 5),
+            'mean_abs_pixels': round(float(deviation.mean() * 224), 3),
+            'max_abs_pixels': round(float(deviation.max() * 224), 3),
+            'per_coordinate_mean_abs': {
+                name: round(float(value), 5)
+                for name, value in zip(('x', 'y', 'width', 'height'), deviation.mean(axis=0))
+            }
+        }
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantification int8 du modèle de fenêtres")
+    parser.add_argument('--samples', required=True, help="Dossier d'images représentatives (calibration)")
+    parser.add_argument('--eval', help="Dossier d'images pour la comparaison (défaut: --samples)")
+    parser.add_argument('--calibration-size', type=int, default=200)
+    parser.add_argument('--eval-size', type=int, default=200)
+    parser.add_argument('--float-model', default=MODEL_PATH)
+    parser.add_argument('--output', default=INT8_MODEL_PATH)
+    parser.add_argument('--report', help="Fichier JSON du rapport de comparaison")
+    args = parser.parse_args(argv)
+
+    calibration = load_sample_arrays(args.samples, args.calibration_size)
+    if not calibration:
+        logger.error("❌ Aucune image de calibration trouvée")
+        return 1
+
+    evaluation = load_sample_arrays(args.eval or args.samples, args.eval_size)
+
+    logger.info(f"📊 Calibration sur {len(calibration)} images, évaluation sur {len(evaluation)}")
+    model = load_float_model(args.float_model)
+    quantize(model, calibration, args.output)
+
+    report = compare(args.float_model, args.output, evaluation)
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"📝 Rapport enregistré: {args.report}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+BreezeFrame Traffic Replay
+Rejoue une capture de trafic (traffic_capture.py) contre un serveur
+
+Les requêtes sont envoyées en respectant les écarts d'arrivée d'origine,
+éventuellement accélérés (--speed 4 = quatre fois plus vite, --speed 0 = le
+plus vite possible). Le résumé des latences peut être comparé à celui d'une
+autre exécution (--compare) pour mesurer l'effet d'une nouvelle version.
+
+Exemples :
+    python replay_traffic.py captures/ --target http://localhost:5000 -o baseline.json
+    python replay_traffic.py captures/ --target http://localhost:5001 --speed 2 --compare baseline.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from traffic_capture import REQUESTS_FILE, blob_path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('replay_traffic')
+
+PERCENTILES = (50, 90, 95, 99)
+
+def load_capture(directory: str, limit: Optional[int] = None) -> List[Dict]:
+    """Enregistrements rejouables (image disponible), triés par arrivée"""
+    records = []
+    with open(os.path.join(directory, REQUESTS_FILE), 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            digest = record.get('payload_sha256')
+            if digest and os.path.exists(blob_path(directory, digest)):
+                records.append(record)
+
+    records.sort(key=lambda r: r['arrival_time'])
+    return records[:limit] if limit else records
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # Méthode du rang le plus proche
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize(latencies: List[float]) -> Dict:
+    values = sorted(latencies)
+    summary = {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 3) if values else None,
+        'max_ms': round(values[-1], 3) if values else None
+    }
+    for pct in PERCENTILES:
+        value = percentile(values, pct)
+        summary[f'p{pct}_ms'] = round(value, 3) if value is not None else None
+    return summary
+
+def ks_statistic(a: List[float], b: List[float]) -> Optional[float]:
+    """Statistique de Kolmogorov-Smirnov entre deux distributions de latence"""
+    if not a or not b:
+        return None
+    a, b = sorted(a), sorted(b)
+    i = j = 0
+    distance = 0.0
+    while i < len(a) and j < len(b):
+        value = min(a[i], b[j])
+        while i < len(a) and a[i] <= value:
+            i += 1
+        while j < len(b) and b[j] <= value:
+            j += 1
+        distance = max(distance, abs(i / len(a) - j / len(b)))
+    return round(distance, 4)
+
+def replay(directory: str, records: List[Dict], target: str, speed: float,
+           concurrency: int, timeout: float) -> Dict:
+    """Envoie les requêtes capturées et mesure les latences côté client"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    results = []
+    results_lock = threading.Lock()
+    url = target.rstrip('/') + '/analyze'
+
+    def send(record):
+        with open(blob_path(directory, record['payload_sha256']), 'rb') as f:
+            image_data = f.read().decode('utf-8')
+
+        start = time.perf_counter()
+        try:
+            response = session.post(url, json={'image': image_data}, timeout=timeout)
+            status = response.status_code
+            try:
+                detector = (response.json().get('detection') or {}).get('method')
+            except ValueError:
+                detector = None
+        except requests.RequestException as e:
+            status, detector = None, None
+            logger.warning(f"⚠️ Requête échouée: {e}")
+        latency = (time.perf_counter() - start) * 1000
+
+        with results_lock:
+            results.append({
+                'latency_ms': latency,
+                'status': status,
+                'detector': detector,
+                'captured_detector': record.get('detector'),
+                'captured_processing_time_ms': record.get('processing_time_ms')
+            })
+
+    first_arrival = records[0]['arrival_time']
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for record in records:
+            if speed > 0:
+                delay = (record['arrival_time'] - first_arrival) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(send, record)
+
+    elapsed = time.monotonic() - start
+    latencies = [r['latency_ms'] for r in results]
+    errors = sum(1 for r in results if r['status'] is None or r['status'] >= 500)
+
+    by_detector = {}
+    for r in results:
+        by_detector.setdefault(r['detector'] or 'unknown', []).append(r['latency_ms'])
+
+    captured = [r['captured_processing_time_ms'] for r in results if r['captured_processing_time_ms'] is not None]
+    detector_changes = sum(
+        1 for r in results
+        if r['detector'] and r['captured_detector'] and r['detector'] != r['captured_detector']
+    )
+
+    return {
+        'target': target,
+        'speed': speed,
+        'requests': len(results),
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 2),
+        'throughput_rps': round(len(results) / elapsed, 2) if elapsed > 0 else None,
+        'latency': summarize(latencies),
+        'latency_by_detector': {name: summarize(values) for name, values in by_detector.items()},
+        'captured_processing_time': summarize(captured),
+        'detector_changes': detector_changes,
+        'latencies_ms': [round(value, 3) for value in latencies]
+    }
+
+def diff(current: Dict, baseline: Dict) -> Dict:
+    """Écarts de distribution de latence entre deux exécutions"""
+    comparison = {}
+    for key in ['mean_ms', 'max_ms'] + [f'p{pct}_ms' for pct in PERCENTILES]:
+        before = baseline['latency'].get(key)
+        after = current['latency'].get(key)
+        if before is None or after is None:
+            continue
+        comparison[key] = {
+            'baseline': before,
+            'current': after,
+            'delta_ms': round(after - before, 3),
+            'delta_pct': round((after - before) / before * 100, 2) if before else None
+        }
+
+    return {
+        'baseline_target': baseline.get('target'),
+        'current_target': current.get('target'),
+        'latency': comparison,
+        'ks_statistic': ks_statistic(current.get('latencies_ms', []), baseline.get('latencies_ms', [])),
+        'errors': {'baseline': baseline.get('errors'), 'current': current.get('errors')}
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rejoue une capture de trafic BreezeFrame")
+    parser.add_argument('capture', help="Dossier de capture (CAPTURE_DIR)")
+    parser.add_argument('--target', default='http://localhost:5000', help="URL du serveur à tester")
+    parser.add_argument('--speed', type=float, default=1.0, help="Facteur d'accélération (0 = sans attente)")
+    parser.add_argument('--concurrency', type=int, default=32, help="Requêtes simultanées max")
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--limit', type=int, help="Nombre max de requêtes rejouées")
+    parser.add_argument('-o', '--output', help="Fichier JSON du résumé")
+    parser.add_argument('--compare', help="Résumé d'une exécution précédente à comparer")
+    args = parser.parse_args(argv)
+
+    records = load_capture(args.capture, args.limit)
+    if not records:
+        logger.error("❌ Aucune requête rejouable dans la capture")
+        return 1
+
+    logger.info(f"▶️ Rejeu de {len(records)} requêtes vers {args.target} (vitesse x{args.speed})")
+    summary = replay(args.capture, records, args.target, args.speed, args.concurrency, args.timeout)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        logger.info(f"📝 Résumé enregistré: {args.output}")
+
+    report = {key: value for key, value in summary.items() if key != 'latencies_ms'}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            report['comparison'] = diff(summary, json.load(f))
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+BreezeFrame Serialization
+Encodage rapide des réponses API (JSON / MessagePack) et sélection de champs
+"""
+
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Encodeurs optionnels
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+# Champs toujours conservés par le sélecteur fields=
+ALWAYS_KEPT_FIELDS = ('success', 'error', 'message')
+
+def _default(obj):
+    """Conversion des types numpy non gérés nativement"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+def encode_json(payload) -> bytes:
+    """Encode en JSON avec orjson si disponible, sinon la stdlib"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            payload,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        payload,
+        default=_default,
+        ensure_ascii=False,
+        separators=(',', ':')
+    ).encode('utf-8')
+
+def encode_msgpack(payload) -> bytes:
+    """Encode en MessagePack"""
+    return msgpack.packb(payload, default=_default, use_bin_type=True)
+
+def wants_msgpack(accept_header: str) -> bool:
+    """Négociation via l'en-tête Accept (MessagePack seulement s'il est préféré)"""
+    if not accept_header or not MSGPACK_AVAILABLE:
+        return False
+
+    best_msgpack = 0.0
+    best_json = 0.0
+    for item in accept_header.split(','):
+        parts = [p.strip() for p in item.split(';')]
+        mimetype = parts[0].lower()
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if mimetype in MSGPACK_MIMETYPES:
+            best_msgpack = max(best_msgpack, quality)
+        elif mimetype in (JSON_MIMETYPE, 'application/*', '*/*'):
+            best_json = max(best_json, quality)
+
+    return best_msgpack > 0 and best_msgpack >= best_json
+
+def parse_fields(fields_param):
+    """Convertit 'dimensions,kit_recommendation' en ensemble de champs"""
+    if not fields_param:
+        return None
+    fields = {f.strip() for f in fields_param.split(',') if f.strip()}
+    return fields or None
+
+def _select(result, fields):
+    if not isinstance(result, dict):
+        return result
+    return {
+        key: value for key, value in result.items()
+        if key in fields or key in ALWAYS_KEPT_FIELDS
+    }
+
+def select_fields(payload, fields):
+    """Ne conserve que les champs demandés (appliqué à chaque résultat d'un lot)"""
+    if not fields or not isinstance(payload, dict):
+        return payload
+
+    if isinstance(payload.get('results'), list):
+        selected = dict(payload)
+        selected['results'] = [_select(r, fields) for r in payload['results']]
+        return selected
+
+    return _select(payload, fields)
+
+def encode_response(payload, accept_header=None, fields_param=None):
+    """Encode une réponse, retourne (corps, content-type)"""
+    payload = select_fields(payload, parse_fields(fields_param))
+
+    if wants_msgpack(accept_header):
+        return encode_msgpack(payload), MSGPACK_MIMETYPE
+
+    return encode_json(payload), JSON_MIMETYPE
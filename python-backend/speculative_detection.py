@@ -0,0 +1,129 @@
+"""
+BreezeFrame Speculative Detection
+Exécution spéculative des détecteurs TensorFlow et OpenCV en parallèle
+
+Les deux détecteurs démarrent en même temps sur l'image décodée. Le premier
+résultat qui atteint le seuil de confiance est retourné ; l'autre est
+abandonné (son temps de calcul est tout de même comptabilisé quand il se termine).
+
+Les coûts sont mesurés en temps mur par détecteur, pas en temps CPU : le
+thread du détecteur ne fait qu'attendre pendant que TensorFlow calcule dans
+ses propres pools (ou dans un processus de réplique), et le temps CPU du
+processus mélange les deux détecteurs et les autres requêtes.
+Si aucun n'atteint le seuil, on applique l'ordre habituel : TensorFlow s'il
+a détecté une fenêtre, sinon OpenCV.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def _timed(detector: Callable, image) -> Dict:
+    """Exécute un détecteur en mesurant son temps mur"""
+    wall_start = time.perf_counter()
+    try:
+        result = detector(image)
+    except Exception as e:
+        logger.warning(f"⚠️ Détecteur spéculatif en erreur: {e}")
+        result = None
+    return {
+        'result': result,
+        'wall_ms': (time.perf_counter() - wall_start) * 1000
+    }
+
+def _meets_threshold(result: Optional[Dict], threshold: float) -> bool:
+    return bool(result) and result.get('detected', False) and result.get('confidence', 0.0) >= threshold
+
+class SpeculativeDetector:
+    """Lance TensorFlow et OpenCV simultanément et garde le premier résultat suffisant"""
+
+    def __init__(self, tensorflow_detector: Callable, opencv_detector: Callable,
+                 confidence_threshold: float, max_workers: int = 4):
+        self.tensorflow_detector = tensorflow_detector
+        self.opencv_detector = opencv_detector
+        self.confidence_threshold = confidence_threshold
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='speculative-detector'
+        )
+        self.lock = threading.Lock()
+        self.stats_counters = {
+            'runs': 0,
+            'early_returns': 0,
+            'paid_off': 0,
+            'tensorflow_results': 0,
+            'opencv_results': 0,
+            'used_wall_ms': 0.0,
+            'discarded_wall_ms': 0.0
+        }
+
+    def _count(self, **increments):
+        with self.lock:
+            for key, value in increments.items():
+                self.stats_counters[key] += value
+
+    def _discard(self, future):
+        """Comptabilise le temps d'un détecteur abandonné une fois terminé"""
+        if not future.cancelled():
+            self._count(discarded_wall_ms=future.result()['wall_ms'])
+
+    def detect(self, image_array, image_original) -> Dict:
+        futures = {
+            self.executor.submit(_timed, self.tensorflow_detector, image_array): 'tensorflow',
+            self.executor.submit(_timed, self.opencv_detector, image_original): 'opencv'
+        }
+        outcomes = {}
+        chosen = None
+        pending = set(futures)
+
+        while pending and chosen is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                outcomes[name] = future.result()
+                if chosen is None and _meets_threshold(outcomes[name]['result'], self.confidence_threshold):
+                    chosen = name
+
+        if chosen is None:
+            # Aucun résultat au-dessus du seuil : ordre séquentiel habituel
+            tensorflow_result = outcomes['tensorflow']['result']
+            chosen = 'tensorflow' if tensorflow_result and tensorflow_result.get('detected', False) else 'opencv'
+
+        for future in pending:
+            future.add_done_callback(self._discard)
+
+        # Temps des résultats terminés mais non retenus
+        discarded_wall = sum(o['wall_ms'] for name, o in outcomes.items() if name != chosen)
+
+        # Le mode séquentiel aurait attendu TensorFlow avant de lancer OpenCV
+        self._count(
+            runs=1,
+            early_returns=1 if pending else 0,
+            paid_off=1 if chosen == 'opencv' else 0,
+            tensorflow_results=1 if chosen == 'tensorflow' else 0,
+            opencv_results=1 if chosen == 'opencv' else 0,
+            used_wall_ms=outcomes[chosen]['wall_ms'],
+            discarded_wall_ms=discarded_wall
+        )
+
+        return outcomes[chosen]['result']
+
+    def stats(self) -> Dict:
+        with self.lock:
+            counters = dict(self.stats_counters)
+
+        runs = max(counters['runs'], 1)
+        used_wall = max(counters['used_wall_ms'], 1e-9)
+        return {
+            **{k: round(v, 2) if isinstance(v, float) else v for k, v in counters.items()},
+            'confidence_threshold': self.confidence_threshold,
+            'payoff_rate': round(counters['paid_off'] / runs, 4),
+            'wall_overhead_ratio': round(counters['discarded_wall_ms'] / used_wall, 4)
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
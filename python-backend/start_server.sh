@@ -100,11 +100,13 @@ python -c "import cv2; print(f'✅ OpenCV {cv2.__version__} OK')" 2>/dev/null ||
 export FLASK_ENV=development
 export PORT=5000
 export DEBUG=true
+export SERVER_MODE=${SERVER_MODE:-wsgi}
 
 log_info "Configuration:"
 log_info "  Port: $PORT"
 log_info "  Debug: $DEBUG"
 log_info "  Flask Env: $FLASK_ENV"
+log_info "  Mode: $SERVER_MODE"
 
 # Démarrer le serveur
 echo ""
@@ -113,7 +115,11 @@ log_info "Appuyez sur Ctrl+C pour arrêter"
 echo "========================================"
 
 # Lancer l'application
-$PYTHON_CMD app.py
+if [ "$SERVER_MODE" = "asgi" ]; then
+    $PYTHON_CMD asgi_app.py
+else
+    $PYTHON_CMD app.py
+fi
 
 # Message de fin
 echo ""
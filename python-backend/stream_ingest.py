@@ -0,0 +1,287 @@
+"""
+BreezeFrame Stream Ingestion
+Lecture en flux d'archives tar / zip et d'envois multipart pour les gros lots
+
+Les entrées sont extraites une à une du flux de la requête et envoyées à
+l'analyse dès leur arrivée. Au plus ``window`` images sont en mémoire à la
+fois (en cours d'analyse ou en attente d'envoi), quelle que soit la taille
+du lot.
+"""
+
+import base64
+import struct
+import tarfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Tuple
+
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+CHUNK_SIZE = 64 * 1024
+
+TAR_MIMETYPES = ('application/x-tar', 'application/tar', 'application/gzip', 'application/x-gzip', 'application/x-gtar')
+ZIP_MIMETYPES = ('application/zip', 'application/x-zip-compressed')
+
+class StreamFormatError(Exception):
+    """Flux d'archive invalide ou non supporté"""
+
+class EntryTooLarge(Exception):
+    """Entrée au-delà de la taille maximale autorisée"""
+
+class StreamReader:
+    """Lecture exacte sur un flux non « seekable », avec remise en tête"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = b''
+
+    def _fill(self, size: int) -> bool:
+        chunk = self.stream.read(max(size, CHUNK_SIZE))
+        if not chunk:
+            return False
+        self.buffer += chunk
+        return True
+
+    def read(self, size: int) -> bytes:
+        """Jusqu'à ``size`` octets (moins en fin de flux)"""
+        if not self.buffer:
+            self._fill(size)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def read_exact(self, size: int) -> bytes:
+        while len(self.buffer) < size:
+            if not self._fill(size - len(self.buffer)):
+                raise StreamFormatError("Fin de flux inattendue")
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def unread(self, data: bytes):
+        self.buffer = data + self.buffer
+
+def is_image_name(name: str) -> bool:
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+def iter_tar_entries(stream, max_entry_bytes: int) -> Iterator[Tuple[str, object]]:
+    """Entrées image d'un tar (éventuellement compressé), lues séquentiellement"""
+    try:
+        with tarfile.open(fileobj=stream, mode='r|*') as archive:
+            for member in archive:
+                if not member.isfile() or not is_image_name(member.name):
+                    continue
+                if member.size > max_entry_bytes:
+                    yield member.name, EntryTooLarge(f"{member.size} octets")
+                    continue
+                yield member.name, archive.extractfile(member).read()
+    except (tarfile.TarError, EOFError, OSError, zlib.error) as e:
+        raise StreamFormatError(f"Archive tar invalide: {e}")
+
+ZIP_LOCAL_HEADER = 0x04034b50
+ZIP_DATA_DESCRIPTOR = 0x08074b50
+ZIP_STOP_SIGNATURES = (0x02014b50, 0x06054b50, 0x06064b50)
+
+def _zip64_sizes(extra: bytes, compressed: int, uncompressed: int) -> Tuple[int, int]:
+    """Tailles réelles depuis le champ extra ZIP64 (0x0001) si présent"""
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, size = struct.unpack('<HH', extra[offset:offset + 4])
+        if header_id == 0x0001:
+            values = extra[offset + 4:offset + 4 + size]
+            fields = []
+            if uncompressed == 0xFFFFFFFF:
+                fields.append('uncompressed')
+            if compressed == 0xFFFFFFFF:
+                fields.append('compressed')
+            parsed = dict(zip(fields, struct.unpack(f'<{len(fields)}Q', values[:8 * len(fields)])))
+            return parsed.get('compressed', compressed), parsed.get('uncompressed', uncompressed)
+        offset += 4 + size
+    return compressed, uncompressed
+
+def _inflate_until_end(reader: StreamReader, max_entry_bytes: int) -> bytes:
+    """Décompresse un flux deflate dont la taille n'est pas connue à l'avance"""
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    output = []
+    produced = 0
+    while not decompressor.eof:
+        chunk = reader.read(CHUNK_SIZE)
+        if not chunk:
+            raise StreamFormatError("Entrée zip tronquée")
+        try:
+            data = decompressor.decompress(chunk)
+        except zlib.error as e:
+            raise StreamFormatError(f"Entrée zip corrompue: {e}")
+        produced += len(data)
+        if produced > max_entry_bytes:
+            raise EntryTooLarge(f"> {max_entry_bytes} octets")
+        output.append(data)
+    reader.unread(decompressor.unused_data)
+    return b''.join(output)
+
+def iter_zip_entries(stream, max_entry_bytes: int) -> Iterator[Tuple[str, object]]:
+    """Entrées image d'un zip lues via les en-têtes locaux (sans répertoire central)
+
+    Supporte les méthodes stored et deflate, y compris les entrées deflate
+    avec descripteur de données (archives produites en flux).
+    """
+    reader = StreamReader(stream)
+    while True:
+        signature_bytes = reader.read_exact(4)
+        signature, = struct.unpack('<I', signature_bytes)
+        if signature in ZIP_STOP_SIGNATURES:
+            return
+        if signature != ZIP_LOCAL_HEADER:
+            raise StreamFormatError("Signature zip invalide")
+
+        (_, flags, method, _, _, _, compressed, uncompressed,
+         name_length, extra_length) = struct.unpack('<HHHHHIIIHH', reader.read_exact(26))
+        name = reader.read_exact(name_length).decode('utf-8' if flags & 0x800 else 'cp437')
+        extra = reader.read_exact(extra_length)
+        compressed, uncompressed = _zip64_sizes(extra, compressed, uncompressed)
+        has_descriptor = bool(flags & 0x08)
+
+        if flags & 0x01:
+            raise StreamFormatError(f"Entrée chiffrée non supportée: {name}")
+        if method not in (0, 8):
+            raise StreamFormatError(f"Méthode de compression {method} non supportée: {name}")
+
+        wanted = is_image_name(name) and not name.endswith('/')
+
+        if has_descriptor and method == 8:
+            try:
+                data = _inflate_until_end(reader, max_entry_bytes)
+            except EntryTooLarge as e:
+                # Taille inconnue : impossible de sauter l'entrée proprement
+                raise StreamFormatError(f"{name}: {e}")
+        elif has_descriptor and compressed == 0:
+            raise StreamFormatError(f"Entrée stockée de taille inconnue non supportée: {name}")
+        elif compressed > max_entry_bytes or uncompressed > max_entry_bytes:
+            # On lit l'entrée par morceaux sans la garder
+            remaining = compressed
+            while remaining:
+                remaining -= len(reader.read_exact(min(remaining, CHUNK_SIZE)))
+            data = EntryTooLarge(f"{uncompressed} octets")
+        else:
+            raw = reader.read_exact(compressed)
+            try:
+                data = zlib.decompress(raw, -zlib.MAX_WBITS) if method == 8 else raw
+            except zlib.error as e:
+                raise StreamFormatError(f"Entrée zip corrompue {name}: {e}")
+
+        if has_descriptor:
+            descriptor = reader.read_exact(4)
+            if struct.unpack('<I', descriptor)[0] != ZIP_DATA_DESCRIPTOR:
+                reader.unread(descriptor)
+            reader.read_exact(12)
+
+        if wanted:
+            yield name, data
+
+def iter_multipart_entries(stream, boundary: bytes, max_entry_bytes: int) -> Iterator[Tuple[str, object]]:
+    """Parties d'un envoi multipart, émises dès qu'elles sont complètes
+
+    Les parties fichier sont des images brutes ; les champs texte sont
+    traités comme des images en base64 (éventuellement en data URL).
+    """
+    decoder = MultipartDecoder(boundary)
+    current_name = None
+    is_file = False
+    parts = []
+    size = 0
+    too_large = False
+
+    while True:
+        try:
+            event = decoder.next_event()
+            if isinstance(event, NeedData):
+                decoder.receive_data(stream.read(CHUNK_SIZE) or None)
+                continue
+        except ValueError as e:
+            # Corps tronqué ou mal formé
+            raise StreamFormatError(f"Envoi multipart invalide: {e}")
+
+        if isinstance(event, (File, Field)):
+            is_file = isinstance(event, File)
+            current_name = (event.filename if is_file else None) or event.name
+            parts, size, too_large = [], 0, False
+
+        elif isinstance(event, Data):
+            size += len(event.data)
+            if size > max_entry_bytes:
+                too_large = True
+                parts = []
+            elif not too_large:
+                parts.append(event.data)
+
+            if not event.more_data:
+                if too_large:
+                    yield current_name, EntryTooLarge(f"> {max_entry_bytes} octets")
+                    continue
+
+                payload = b''.join(parts)
+                if is_file:
+                    yield current_name, payload
+                else:
+                    text = payload.decode('ascii', errors='ignore').strip()
+                    if text.startswith('data:image'):
+                        text = text.split(',', 1)[1]
+                    try:
+                        yield current_name, base64.b64decode(text)
+                    except ValueError as e:
+                        yield current_name, e
+
+        elif isinstance(event, Epilogue):
+            return
+
+def open_entries(mimetype: str, params: Dict, stream, max_entry_bytes: int):
+    """Itérateur d'entrées adapté au Content-Type, ou None si non supporté"""
+    if mimetype in TAR_MIMETYPES:
+        return iter_tar_entries(stream, max_entry_bytes)
+    if mimetype in ZIP_MIMETYPES:
+        return iter_zip_entries(stream, max_entry_bytes)
+    if mimetype == 'multipart/form-data':
+        boundary = params.get('boundary')
+        if not boundary:
+            raise StreamFormatError("Boundary multipart manquante")
+        return iter_multipart_entries(stream, boundary.encode('latin-1'), max_entry_bytes)
+    return None
+
+def stream_analyze(entries: Iterator[Tuple[str, object]], analyze: Callable[[bytes], Dict],
+                   executor: ThreadPoolExecutor, window: int) -> Iterator[Dict]:
+    """Analyse les entrées au fil de l'eau, au plus ``window`` en vol
+
+    Les résultats sont émis dans l'ordre d'arrivée des entrées.
+    """
+    in_flight = deque()
+
+    def emit(item):
+        index, name, pending = item
+        if isinstance(pending, Future):
+            try:
+                pending = pending.result()
+            except Exception as e:
+                pending = {'success': False, 'error': str(e)}
+        return {'index': index, 'name': name, **pending}
+
+    try:
+        for index, (name, data) in enumerate(entries):
+            if isinstance(data, EntryTooLarge):
+                pending = {'success': False, 'error': f'Entry too large: {data}'}
+            elif isinstance(data, Exception):
+                pending = {'success': False, 'error': f'Invalid entry: {data}'}
+            else:
+                pending = executor.submit(analyze, data)
+            in_flight.append((index, name, pending))
+
+            # Fenêtre pleine : on attend la plus ancienne avant de lire la suite
+            while len(in_flight) >= window:
+                yield emit(in_flight.popleft())
+    except StreamFormatError:
+        # Les entrées déjà lues sont rendues avant de signaler le flux invalide
+        while in_flight:
+            yield emit(in_flight.popleft())
+        raise
+
+    while in_flight:
+        yield emit(in_flight.popleft())
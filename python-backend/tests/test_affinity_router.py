@@ -0,0 +1,128 @@
+"""
+Tests du routeur à affinité avec de vrais backends locaux (app.py) comme nœuds
+"""
+
+import base64
+import io
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+from PIL import Image
+
+import profiling
+from affinity_router import AffinityRing, make_handler, spawn_backends
+
+NODE_COUNT = 3
+ADMIN_HEADERS = {'X-Admin-Token': 'router-test-token'}
+
+def free_port_range(count: int) -> int:
+    """Premier port d'une plage de ``count`` ports libres consécutifs"""
+    for base in range(20000, 40000, count):
+        try:
+            sockets = []
+            for port in range(base, base + count):
+                sock = socket.socket()
+                sockets.append(sock)
+                sock.bind(('127.0.0.1', port))
+            return base
+        except OSError:
+            continue
+        finally:
+            for sock in sockets:
+                sock.close()
+    raise RuntimeError('Aucune plage de ports libre')
+
+def wait_healthy(url: str, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url + '/health', timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f'Backend {url} non démarré')
+
+def image_payload(seed: int) -> dict:
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), (seed % 256, seed * 7 % 256, 90)).save(buffer, 'PNG')
+    return {'image': base64.b64encode(buffer.getvalue()).decode('ascii')}
+
+@pytest.fixture(scope='module')
+def backends():
+    base_port = free_port_range(NODE_COUNT)
+    processes = spawn_backends(NODE_COUNT, base_port)
+    urls = [f'http://127.0.0.1:{base_port + i}' for i in range(NODE_COUNT)]
+    try:
+        for url in urls:
+            wait_healthy(url)
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+@pytest.fixture
+def router(backends, monkeypatch):
+    monkeypatch.setattr(profiling, 'ADMIN_TOKEN', ADMIN_HEADERS['X-Admin-Token'])
+    ring = AffinityRing()
+    for url in backends:
+        ring.add(url)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(ring, timeout=30))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def routed_node(router: str, payload: dict) -> str:
+    response = requests.post(router + '/analyze', json=payload, timeout=30)
+    assert response.status_code == 200
+    return response.headers['X-Routed-Node']
+
+def test_repeat_uploads_stick_to_one_node(router):
+    for seed in range(8):
+        payload = image_payload(seed)
+        nodes = {routed_node(router, payload) for _ in range(3)}
+        # Le préfixe data URL ne change pas la clé d'affinité
+        nodes.add(routed_node(router, {'image': 'data:image/png;base64,' + payload['image']}))
+        assert len(nodes) == 1
+
+def test_removing_a_node_moves_only_its_keys(router, backends):
+    payloads = [image_payload(seed) for seed in range(40)]
+    before = [routed_node(router, payload) for payload in payloads]
+    removed = backends[0]
+    assert removed in before
+
+    response = requests.delete(router + '/router/nodes', json={'url': removed}, headers=ADMIN_HEADERS)
+    assert response.json()['changed'] is True
+
+    after = [routed_node(router, payload) for payload in payloads]
+    for old, new in zip(before, after):
+        if old == removed:
+            assert new != removed
+        else:
+            assert new == old
+
+def test_stats_report_per_node_hit_rates(router, backends):
+    assert requests.get(router + '/router/stats').status_code == 403
+
+    for _ in range(2):
+        for seed in range(10):
+            routed_node(router, image_payload(seed))
+
+    stats = requests.get(router + '/router/stats', headers=ADMIN_HEADERS).json()
+    assert set(stats['nodes']) == set(backends)
+    assert stats['requests'] == 20
+    assert stats['hit_rate'] == 0.5
+    for node in stats['nodes'].values():
+        if node['requests']:
+            assert node['hit_rate'] == 0.5
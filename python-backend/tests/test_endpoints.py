@@ -0,0 +1,120 @@
+"""
+Tests d'endpoints partagés : mêmes cas sur le serveur Flask (WSGI) et Starlette (ASGI)
+"""
+
+import base64
+import io
+import json
+
+import pytest
+from PIL import Image
+from starlette.testclient import TestClient
+
+import app as flask_backend
+import asgi_app
+import profiling
+
+def image_data() -> str:
+    buffer = io.BytesIO()
+    Image.new('RGB', (80, 60), (200, 180, 40)).save(buffer, 'PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+class FlaskCaller:
+    def __init__(self):
+        self.client = flask_backend.app.test_client()
+
+    def __call__(self, method, path, json_body=None, body=None, headers=None):
+        kwargs = {'json': json_body} if json_body is not None else {}
+        if body is not None:
+            kwargs = {'data': body, 'content_type': 'application/json'}
+        response = self.client.open(path, method=method, headers=headers, **kwargs)
+        return response.status_code, response.mimetype, json.loads(response.data)
+
+class AsgiCaller:
+    def __init__(self):
+        self.client = TestClient(asgi_app.app)
+
+    def __call__(self, method, path, json_body=None, body=None, headers=None):
+        kwargs = {'json': json_body} if json_body is not None else {}
+        if body is not None:
+            kwargs = {'content': body}
+            headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+        response = self.client.request(method, path, headers=headers, **kwargs)
+        return response.status_code, response.headers['content-type'].split(';')[0], response.json()
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def call(request):
+    return FlaskCaller() if request.param == 'wsgi' else AsgiCaller()
+
+def test_health(call):
+    status, content_type, payload = call('GET', '/health')
+    assert (status, content_type) == (200, 'application/json')
+    assert payload['status'] == 'healthy'
+    assert payload['version'] == flask_backend.BACKEND_VERSION
+
+def test_analyze(call):
+    status, _, payload = call('POST', '/analyze', json_body={'image': image_data()})
+    assert status == 200
+    assert payload['success'] is True
+    assert {'detection', 'kit_recommendation', 'processing_time_ms'} <= set(payload)
+
+def test_analyze_requires_image(call):
+    status, _, payload = call('POST', '/analyze', json_body={})
+    assert status == 400
+    assert payload['error'] == 'Image data required'
+
+def test_batch_analyze(call):
+    status, _, payload = call('POST', '/batch-analyze', json_body={'images': [image_data(), 'not-an-image']})
+    assert status == 200
+    assert payload['summary'] == {'total': 2, 'successful': 1, 'failed': 1}
+    assert payload['results'][1] == {'success': False, 'error': 'Image preprocessing failed'}
+
+def test_stats(call):
+    status, _, payload = call('GET', '/stats')
+    assert status == 200
+    assert payload['success'] is True
+    assert 'total_analyses' in payload['stats']
+
+class StubSwapper:
+    def status(self):
+        return {'active': {'version': 'v-test'}, 'previous': None, 'last_swap': None}
+
+class StubAnalyzer:
+    model_version = 'v-test'
+    models = StubSwapper()
+
+def test_model_info(call):
+    status, _, payload = call('GET', '/model-info')
+    assert status == 200
+    assert payload['model_info']['capabilities']['window_detection'] is True
+    assert payload['model_info']['model_version'] is None
+
+def test_model_info_reports_loaded_version(call, monkeypatch):
+    monkeypatch.setattr(flask_backend, 'WINDOW_ANALYZER', StubAnalyzer())
+    status, _, payload = call('GET', '/model-info')
+    assert status == 200
+    assert payload['model_info']['model_version'] == 'v-test'
+    assert payload['model_info']['model_versions']['active']['version'] == 'v-test'
+
+def test_model_admin_without_loaded_model(call, monkeypatch):
+    monkeypatch.setattr(profiling, 'ADMIN_TOKEN', 'endpoint-test-token')
+    status, _, payload = call('GET', '/admin/model', headers={'X-Admin-Token': 'endpoint-test-token'})
+    assert status == 503
+    assert payload['error'] == 'Model not loaded'
+
+@pytest.mark.parametrize('path', ['/analyze', '/batch-analyze'])
+def test_invalid_json(call, path):
+    status, _, payload = call('POST', path, body=b'{not json')
+    assert status == 400
+    assert payload['error'] == 'Invalid JSON'
+
+def test_not_found(call):
+    status, _, payload = call('GET', '/does-not-exist')
+    assert status == 404
+    assert payload['error'] == 'Endpoint not found'
+
+def test_payload_too_large(call):
+    body = b'{"image": "' + b'A' * flask_backend.MAX_CONTENT_LENGTH + b'"}'
+    status, _, payload = call('POST', '/analyze', body=body)
+    assert status == 413
+    assert payload['error'] == 'File too large'
@@ -0,0 +1,38 @@
+"""
+Tests de l'exécuteur d'inférence à répliques (processus épinglés)
+"""
+
+import os
+from functools import partial
+
+import numpy as np
+import pytest
+
+from inference_executor import InferenceExecutor, available_cpus, partition_cpus
+from window_model import build_window_model, load_window_model
+
+def test_partition_cpus():
+    assert partition_cpus([0, 1, 2, 3, 4], 2) == [{0, 1, 2}, {3, 4}]
+    assert partition_cpus([0, 1], 3) == [{0}, {1}, {0}]
+
+@pytest.mark.skipif(not hasattr(os, 'sched_getaffinity'), reason='sched_getaffinity indisponible')
+def test_replicas_are_pinned_processes_with_same_predictions():
+    model = build_window_model()
+    factory = partial(load_window_model, 'float32', None, model.get_weights())
+    cpus = available_cpus()
+    executor = InferenceExecutor(factory, replicas=2, queue_size=4, cpus=cpus)
+    try:
+        groups = partition_cpus(cpus, 2)
+        for replica, group in zip(executor.replicas, groups):
+            assert replica.process.pid != os.getpid()
+            assert os.sched_getaffinity(replica.process.pid) == group
+
+        batch = np.random.rand(3, 224, 224, 3).astype(np.float32)
+        expected = model.predict(batch, verbose=0)
+        for _ in range(4):
+            np.testing.assert_allclose(executor.predict(batch), expected, atol=1e-5)
+
+        completed = sum(r['completed'] for r in executor.stats()['per_replica'])
+        assert completed == 4
+    finally:
+        executor.shutdown()
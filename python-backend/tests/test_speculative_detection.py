@@ -0,0 +1,39 @@
+"""
+Tests de la détection spéculative : choix du détecteur et temps comptabilisé
+"""
+
+import time
+
+from speculative_detection import SpeculativeDetector
+
+def slow_detector(image):
+    # Attente hors du thread Python, comme TensorFlow dans ses propres pools
+    time.sleep(0.2)
+    return {'detected': True, 'confidence': 0.3}
+
+def fast_detector(image):
+    return {'detected': True, 'confidence': 0.9}
+
+def test_first_confident_result_wins_and_discarded_time_is_counted():
+    detector = SpeculativeDetector(slow_detector, fast_detector, confidence_threshold=0.5)
+    try:
+        assert detector.detect(None, None) == {'detected': True, 'confidence': 0.9}
+    finally:
+        detector.executor.shutdown(wait=True)
+
+    stats = detector.stats()
+    assert stats['opencv_results'] == 1
+    assert stats['early_returns'] == 1
+    assert stats['discarded_wall_ms'] >= 200
+    assert stats['wall_overhead_ratio'] > 1
+
+def test_sequential_order_without_confident_result():
+    detector = SpeculativeDetector(fast_detector, slow_detector, confidence_threshold=0.95)
+    try:
+        assert detector.detect(None, None)['confidence'] == 0.9
+    finally:
+        detector.shutdown()
+
+    stats = detector.stats()
+    assert stats['tensorflow_results'] == 1
+    assert stats['discarded_wall_ms'] >= 200
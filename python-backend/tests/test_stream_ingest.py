@@ -0,0 +1,124 @@
+"""
+Tests de l'ingestion en flux (/batch-analyze/stream), serveurs Flask et Starlette
+"""
+
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+from PIL import Image
+from starlette.testclient import TestClient
+
+import app as backend
+import asgi_app
+
+def png_bytes(seed: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (120 + seed, 90), (seed * 25 % 255, 120, 60)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def ndjson(body: bytes):
+    return [json.loads(line) for line in body.splitlines()]
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def post(request):
+    """POST /batch-analyze/stream, retourne (code HTTP, corps)"""
+    if request.param == 'wsgi':
+        client = backend.app.test_client()
+
+        def send(body, content_type):
+            response = client.post('/batch-analyze/stream', data=body, content_type=content_type)
+            return response.status_code, response.data
+    else:
+        client = TestClient(asgi_app.app)
+
+        def send(body, content_type):
+            response = client.post('/batch-analyze/stream', content=body, headers={'Content-Type': content_type})
+            return response.status_code, response.content
+    return send
+
+def multipart_body(files, boundary='frontier') -> bytes:
+    parts = []
+    for name, data in files:
+        parts.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{name}"\r\n'
+            f'Content-Type: image/png\r\n\r\n'.encode('ascii') + data + b'\r\n'
+        )
+    return b''.join(parts) + f'--{boundary}--\r\n'.encode('ascii')
+
+def tar_archive(images):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+        for i, data in enumerate(images):
+            info = tarfile.TarInfo(f'photos/{i}.png')
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+def test_tar_results_in_archive_order(post):
+    images = [png_bytes(i) for i in range(6)]
+    status, body = post(tar_archive(images), 'application/gzip')
+
+    assert status == 200
+    lines = ndjson(body)
+    assert [line['index'] for line in lines[:-1]] == list(range(6))
+    assert all(line['success'] for line in lines[:-1])
+    assert lines[-1]['summary'] == {'total': 6, 'successful': 6, 'failed': 0}
+
+def test_zip_and_multipart(post):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for i in range(3):
+            archive.writestr(f'{i}.png', png_bytes(i))
+    _, body = post(buffer.getvalue(), 'application/zip')
+    assert ndjson(body)[-1]['summary']['successful'] == 3
+
+    form = multipart_body([(f'{i}.png', png_bytes(i)) for i in range(3)])
+    _, body = post(form, 'multipart/form-data; boundary=frontier')
+    assert [line['name'] for line in ndjson(body)[:-1]] == ['0.png', '1.png', '2.png']
+
+def test_truncated_multipart_ends_with_summary(post):
+    body = multipart_body([('0.png', png_bytes(0))])[:200]
+    status, body = post(body, 'multipart/form-data; boundary=frontier')
+
+    assert status == 200
+    summary = ndjson(body)[-1]
+    assert summary['success'] is False
+    assert 'multipart' in summary['error']
+
+def test_corrupt_deflate_entry_keeps_earlier_results(post):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('0.png', png_bytes(0))
+        archive.writestr('1.png', png_bytes(1))
+    data = bytearray(buffer.getvalue())
+    # Corrompt les données compressées de la seconde entrée
+    second = data.index(b'PK\x03\x04', 4)
+    start = second + 30 + len('1.png')
+    data[start:start + 16] = b'\xff' * 16
+
+    _, body = post(bytes(data), 'application/zip')
+
+    lines = ndjson(body)
+    assert lines[0]['name'] == '0.png' and lines[0]['success']
+    assert lines[-1]['success'] is False
+    assert 'corrompue' in lines[-1]['error']
+
+def test_analysis_exception_becomes_failed_line(post, monkeypatch):
+    def broken(image_bytes):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(backend, 'analyze_image_bytes', broken)
+    _, body = post(tar_archive([png_bytes(0)]), 'application/x-tar')
+
+    lines = ndjson(body)
+    assert lines[0] == {'index': 0, 'name': 'photos/0.png', 'success': False, 'error': 'boom'}
+    assert lines[-1]['summary'] == {'total': 1, 'successful': 0, 'failed': 1}
+
+def test_unsupported_media_type(post):
+    status, body = post(b'x', 'text/plain')
+    assert status == 415
+    assert json.loads(body)['error'] == 'Unsupported media type'
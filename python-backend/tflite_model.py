@@ -0,0 +1,66 @@
+"""
+BreezeFrame TFLite Model
+Modèle TensorFlow Lite (variante int8) avec la même interface que Keras
+"""
+
+import logging
+import os
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+class TFLiteModel:
+    """Enveloppe un interpréteur TFLite derrière ``predict(batch, verbose=0)``
+
+    Un interpréteur n'est pas thread-safe : les appels sont sérialisés par
+    instance. Pour du parallélisme, utiliser plusieurs instances (clone()).
+    """
+
+    def __init__(self, model_path: str, num_threads: int = None):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Modèle TFLite introuvable: {model_path}")
+
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.lock = threading.Lock()
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+
+    def clone(self) -> 'TFLiteModel':
+        return TFLiteModel(self.model_path, self.num_threads)
+
+    def _quantize_input(self, sample: np.ndarray) -> np.ndarray:
+        dtype = self.input_details['dtype']
+        if dtype == np.float32:
+            return sample.astype(np.float32)
+        scale, zero_point = self.input_details['quantization']
+        return np.clip(np.round(sample / scale + zero_point), np.iinfo(dtype).min, np.iinfo(dtype).max).astype(dtype)
+
+    def _dequantize_output(self, output: np.ndarray) -> np.ndarray:
+        if output.dtype == np.float32:
+            return output
+        scale, zero_point = self.output_details['quantization']
+        return (output.astype(np.float32) - zero_point) * scale
+
+    def predict(self, batch: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """Prédiction image par image (entrée du modèle de taille 1)"""
+        outputs = []
+        with self.lock:
+            for sample in batch:
+                self.interpreter.set_tensor(
+                    self.input_details['index'],
+                    self._quantize_input(np.expand_dims(sample, axis=0))
+                )
+                self.interpreter.invoke()
+                outputs.append(self._dequantize_output(
+                    self.interpreter.get_tensor(self.output_details['index'])[0]
+                ))
+        return np.stack(outputs)
+
+    def size_bytes(self) -> int:
+        return os.path.getsize(self.model_path)
@@ -0,0 +1,142 @@
+"""
+BreezeFrame Traffic Capture
+Enregistrement anonymisé des requêtes /analyze pour rejouer le trafic réel
+
+Activation : CAPTURE_TRAFFIC=true (CAPTURE_SAMPLE_RATE, CAPTURE_DIR)
+
+Chaque requête échantillonnée produit une ligne dans <CAPTURE_DIR>/requests.jsonl :
+heure d'arrivée, taille encodée, format et dimensions de l'image, détecteur
+utilisé, temps par étape. L'image est copiée une seule fois sous
+<CAPTURE_DIR>/blobs/ (adressage par SHA-256). Aucune adresse IP ni en-tête
+n'est conservé. L'écriture se fait dans un thread dédié ; si la file est
+pleine, l'enregistrement est abandonné plutôt que de ralentir la requête.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import random
+import threading
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CAPTURE_ENABLED = os.environ.get('CAPTURE_TRAFFIC', 'false').lower() == 'true'
+CAPTURE_SAMPLE_RATE = float(os.environ.get('CAPTURE_SAMPLE_RATE', '1.0'))
+CAPTURE_DIR = os.environ.get('CAPTURE_DIR', 'captures')
+CAPTURE_STORE_PAYLOADS = os.environ.get('CAPTURE_STORE_PAYLOADS', 'true').lower() == 'true'
+CAPTURE_QUEUE_SIZE = int(os.environ.get('CAPTURE_QUEUE_SIZE', '1000'))
+
+REQUESTS_FILE = 'requests.jsonl'
+BLOBS_DIR = 'blobs'
+
+def blob_path(directory: str, digest: str) -> str:
+    return os.path.join(directory, BLOBS_DIR, digest[:2], digest)
+
+def describe_image(image_data: str):
+    """Format et dimensions d'origine (lecture de l'en-tête uniquement)"""
+    try:
+        if image_data.startswith('data:image'):
+            image_data = image_data.split(',')[1]
+        image = Image.open(io.BytesIO(base64.b64decode(image_data)))
+        return image.format, image.size[0], image.size[1]
+    except Exception:
+        return None, None, None
+
+class TrafficRecorder:
+    """Capture échantillonnée des requêtes d'analyse"""
+
+    def __init__(self, directory: str, sample_rate: float,
+                 store_payloads: bool = True, queue_size: int = 1000):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.store_payloads = store_payloads
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.recorded = 0
+        self.dropped = 0
+
+        os.makedirs(os.path.join(directory, BLOBS_DIR), exist_ok=True)
+        self.thread = threading.Thread(target=self._run, name='traffic-capture', daemon=True)
+        self.thread.start()
+        logger.info(f"🎥 Capture du trafic activée ({sample_rate:.0%}) dans {directory}")
+
+    def should_capture(self) -> bool:
+        return random.random() < self.sample_rate
+
+    def record(self, image_data, arrival_time: float, status: int, payload: dict, stages: dict):
+        """Met en file un enregistrement (jamais bloquant)"""
+        try:
+            self.queue.put_nowait((image_data, arrival_time, status, payload, stages))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        requests_path = os.path.join(self.directory, REQUESTS_FILE)
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                record = self._build_record(*item)
+                with open(requests_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                self.recorded += 1
+            except Exception as e:
+                logger.error(f"❌ Erreur capture trafic: {e}")
+
+    def _build_record(self, image_data, arrival_time, status, payload, stages):
+        record = {
+            'endpoint': '/analyze',
+            'arrival_time': arrival_time,
+            'status': status,
+            'detector': (payload.get('detection') or {}).get('method'),
+            'success': payload.get('success', False),
+            'processing_time_ms': payload.get('processing_time_ms'),
+            'stages': stages,
+            'payload_sha256': None,
+            'encoded_size': None,
+            'image_format': None,
+            'width': None,
+            'height': None
+        }
+
+        if isinstance(image_data, str):
+            encoded = image_data.encode('utf-8')
+            digest = hashlib.sha256(encoded).hexdigest()
+            image_format, width, height = describe_image(image_data)
+            record.update({
+                'payload_sha256': digest,
+                'encoded_size': len(encoded),
+                'image_format': image_format,
+                'width': width,
+                'height': height
+            })
+
+            path = blob_path(self.directory, digest)
+            if self.store_payloads and not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(encoded)
+                os.replace(tmp_path, path)
+
+        return record
+
+    def stats(self) -> dict:
+        return {
+            'directory': self.directory,
+            'sample_rate': self.sample_rate,
+            'recorded': self.recorded,
+            'dropped': self.dropped,
+            'queued': self.queue.qsize()
+        }
+
+recorder = TrafficRecorder(
+    CAPTURE_DIR, CAPTURE_SAMPLE_RATE, CAPTURE_STORE_PAYLOADS, CAPTURE_QUEUE_SIZE
+) if CAPTURE_ENABLED else None
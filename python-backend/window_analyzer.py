@@ -13,21 +13,64 @@ from typing import Dict, List, Tuple, Optional
 import base64
 from io import BytesIO
 from PIL import Image
+import os
 import time
+from functools import partial
+
+from columnar import DetectionBatch
+from inference_executor import InferenceExecutor
+from model_swap import ModelSwapper, ModelVersion, source_version
+from speculative_detection import SpeculativeDetector
+from window_model import build_window_model, load_window_model
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Modèle : float32 (Keras) ou int8 (TFLite, voir quantize_model.py)
+MODEL_PATH = os.environ.get('MODEL_PATH', 'models/window_model.keras')
+MODEL_VARIANT = os.environ.get('MODEL_VARIANT', 'float32').lower()
+INT8_MODEL_PATH = os.environ.get('INT8_MODEL_PATH', 'models/window_model_int8.tflite')
+# Identifiant de la version initiale (dérivé du fichier si vide)
+MODEL_VERSION = os.environ.get('MODEL_VERSION', '')
+MODEL_WARMUP_RUNS = int(os.environ.get('MODEL_WARMUP_RUNS', '2'))
+
+# Nombre de répliques du modèle (0 = modèle unique partagé)
+INFERENCE_REPLICAS = int(os.environ.get('INFERENCE_REPLICAS', '0'))
+INFERENCE_QUEUE_SIZE = int(os.environ.get('INFERENCE_QUEUE_SIZE', '32'))
+
+# Détection spéculative : TensorFlow et OpenCV lancés en parallèle
+SPECULATIVE_DETECTION = os.environ.get('SPECULATIVE_DETECTION', 'false').lower() == 'true'
+SPECULATIVE_CONFIDENCE_THRESHOLD = float(os.environ.get('SPECULATIVE_CONFIDENCE_THRESHOLD', '0.5'))
+
 class WindowAnalyzer:
     """Analyseur principal pour la détection de fenêtres"""
     
     def __init__(self):
-        self.model = None
+        self.models = ModelSwapper(self.load_model_version, MODEL_WARMUP_RUNS)
         self.backup_cascade = None
         self.is_tensorflow_available = False
+        self.speculative_detector = None
         self.initialize_models()
     
+    # Vues sur la version active (remplaçable à chaud, voir swap_model)
+    
+    @property
+    def model(self):
+        return self.models.current.model if self.models.current else None
+    
+    @property
+    def model_variant(self):
+        return self.models.current.variant if self.models.current else None
+    
+    @property
+    def model_version(self):
+        return self.models.current.version if self.models.current else None
+    
+    @property
+    def inference_executor(self):
+        return self.models.current.executor if self.models.current else None
+    
     def initialize_models(self):
         """Initialise les modèles TensorFlow et OpenCV"""
         try:
@@ -47,27 +90,69 @@ class WindowAnalyzer:
             logger.info("✅ OpenCV fallback initialisé")
         except Exception as e:
             logger.error(f"❌ Erreur OpenCV fallback: {e}")
+        
+        # La spéculation n'a d'intérêt que si les deux détecteurs existent
+        if SPECULATIVE_DETECTION and self.is_tensorflow_available:
+            self.speculative_detector = SpeculativeDetector(
+                self.detect_window_tensorflow,
+                self.detect_window_opencv,
+                SPECULATIVE_CONFIDENCE_THRESHOLD
+            )
+            logger.info(f"⚡ Détection spéculative activée (seuil {SPECULATIVE_CONFIDENCE_THRESHOLD})")
+    
+    def predict(self, image_batch: np.ndarray) -> np.ndarray:
+        """Prédiction sur la version active (répliques ou modèle unique)
+
+        La version est réservée pendant l'appel : un remplacement concurrent
+        ne la libère qu'une fois la prédiction terminée.
+        """
+        version = self.models.acquire()
+        if version is None:
+            raise Exception("Aucun modèle chargé")
+        try:
+            return version.predict(image_batch)
+        finally:
+            version.release()
+    
+    def build_executor(self, model, variant: str, path: Optional[str] = None) -> Optional[InferenceExecutor]:
+        """Processus de répliques du modèle si INFERENCE_REPLICAS > 0
+
+        Chaque réplique recharge le fichier du modèle, ou reçoit ses poids
+        s'il n'existe qu'en mémoire.
+        """
+        if INFERENCE_REPLICAS <= 0:
+            return None
+        if path is not None:
+            factory = partial(load_window_model, variant, path)
+        else:
+            factory = partial(load_window_model, variant, None, model.get_weights())
+        return InferenceExecutor(factory, INFERENCE_REPLICAS, queue_size=INFERENCE_QUEUE_SIZE)
+    
+    def load_model_version(self, path: str, variant: str, version: Optional[str] = None) -> ModelVersion:
+        """Charge un modèle (Keras ou TFLite int8) et ses répliques éventuelles"""
+        model = load_window_model(variant, path)
+        return ModelVersion(
+            model, variant, version or source_version(path), path, self.build_executor(model, variant, path)
+        )
     
     def initialize_tensorflow_model(self):
         """Initialise le modèle TensorFlow pour la détection de fenêtres"""
         try:
-            # Modèle simple CNN pour la détection d'objets rectangulaires
-            self.model = keras.Sequential([
-                keras.layers.Conv2D(32, (3, 3), activation='relu', input_shape=(224, 224, 3)),
-                keras.layers.MaxPooling2D((2, 2)),
-                keras.layers.Conv2D(64, (3, 3), activation='relu'),
-                keras.layers.MaxPooling2D((2, 2)),
-                keras.layers.Conv2D(64, (3, 3), activation='relu'),
-                keras.layers.Flatten(),
-                keras.layers.Dense(64, activation='relu'),
-                keras.layers.Dense(4, activation='sigmoid')  # x, y, width, height
-            ])
+            if MODEL_VARIANT == 'int8':
+                self.models.install(self.load_model_version(INT8_MODEL_PATH, 'int8', MODEL_VERSION or None))
+                logger.info(f"🧠 Modèle int8 chargé: {INT8_MODEL_PATH}")
+                return
             
-            self.model.compile(
-                optimizer='adam',
-                loss='mse',
-                metrics=['mae']
-            )
+            if os.path.exists(MODEL_PATH):
+                self.models.install(self.load_model_version(MODEL_PATH, 'float32', MODEL_VERSION or None))
+                logger.info(f"🧠 Modèle TensorFlow chargé: {MODEL_PATH}")
+                return
+            
+            # Modèle simple CNN pour la détection d'objets rectangulaires
+            model = build_window_model()
+            self.models.install(ModelVersion(
+                model, 'float32', MODEL_VERSION or 'builtin', None, self.build_executor(model, 'float32')
+            ))
             
             logger.info("🧠 Modèle TensorFlow créé")
             
@@ -75,6 +160,21 @@ class WindowAnalyzer:
             logger.error(f"❌ Erreur création modèle TensorFlow: {e}")
             raise
     
+    def swap_model(self, path: str, variant: Optional[str] = None, version: Optional[str] = None) -> Dict:
+        """Charge et préchauffe une nouvelle version en arrière-plan, puis l'active
+
+        Lève RuntimeError si un remplacement est déjà en cours.
+        """
+        if not self.is_tensorflow_available:
+            raise RuntimeError("TensorFlow non disponible")
+        if variant is None:
+            variant = 'int8' if path.endswith('.tflite') else 'float32'
+        return self.models.start(path, variant, version)
+    
+    def rollback_model(self) -> Dict:
+        """Réactive la version précédente (LookupError s'il n'y en a pas)"""
+        return self.models.rollback().info()
+    
     def initialize_opencv_fallback(self):
         """Initialise le système de fallback OpenCV"""
         try:
@@ -94,22 +194,26 @@ class WindowAnalyzer:
                 image_data = image_data.split(',')[1]
             
             image_bytes = base64.b64decode(image_data)
-            image = Image.open(BytesIO(image_bytes))
-            
-            # Conversion en RGB si nécessaire
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Redimensionnement pour TensorFlow
-            image_resized = image.resize((224, 224))
-            image_array = np.array(image_resized) / 255.0
-            
-            return image_array, np.array(image)
+            return self.decode_image_bytes(image_bytes)
         
         except Exception as e:
             logger.error(f"❌ Erreur prétraitement image: {e}")
             raise
     
+    def decode_image_bytes(self, image_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Décode une image brute (PNG, JPEG...) pour l'analyse"""
+        image = Image.open(BytesIO(image_bytes))
+        
+        # Conversion en RGB si nécessaire
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        # Redimensionnement pour TensorFlow
+        image_resized = image.resize((224, 224))
+        image_array = np.array(image_resized) / 255.0
+        
+        return image_array, np.array(image)
+    
     def detect_window_tensorflow(self, image_array: np.ndarray) -> Dict:
         """Détection de fenêtre avec TensorFlow"""
         try:
@@ -118,35 +222,47 @@ class WindowAnalyzer:
             
             # Prédiction avec le modèle
             image_batch = np.expand_dims(image_array, axis=0)
-            prediction = self.model.predict(image_batch, verbose=0)
+            prediction = self.predict(image_batch)
             
-            # Extraction des coordonnées
-            x, y, width, height = prediction[0]
-            
-            # Simulation d'une détection réussie (à remplacer par un vrai modèle entraîné)
-            confidence = 0.85 + np.random.random() * 0.1  # Simulation
-            
-            return {
-                'method': 'tensorflow',
-                'detected': True,
-                'confidence': float(confidence),
-                'bbox': {
-                    'x': float(x * 224),
-                    'y': float(y * 224),
-                    'width': float(width * 224),
-                    'height': float(height * 224)
-                },
-                'dimensions': {
-                    'width_cm': int(100 + width * 100),  # Simulation
-                    'height_cm': int(120 + height * 80),
-                    'confidence': float(confidence)
-                }
-            }
+            return self.detection_from_prediction(prediction[0])
             
         except Exception as e:
             logger.error(f"❌ Erreur détection TensorFlow: {e}")
             raise
     
+    def detect_windows_tensorflow_batch(self, image_arrays: List[np.ndarray]) -> List[Dict]:
+        """Détection TensorFlow sur un lot d'images (un seul appel au modèle)"""
+        if not self.is_tensorflow_available or self.model is None:
+            raise Exception("TensorFlow non disponible")
+        
+        predictions = self.predict(np.stack(image_arrays))
+        return [self.detection_from_prediction(row) for row in predictions]
+    
+    def detection_from_prediction(self, prediction: np.ndarray) -> Dict:
+        """Convertit une sortie du modèle (x, y, width, height) en détection"""
+        # Extraction des coordonnées
+        x, y, width, height = prediction
+        
+        # Simulation d'une détection réussie (à remplacer par un vrai modèle entraîné)
+        confidence = 0.85 + np.random.random() * 0.1  # Simulation
+        
+        return {
+            'method': 'tensorflow',
+            'detected': True,
+            'confidence': float(confidence),
+            'bbox': {
+                'x': float(x * 224),
+                'y': float(y * 224),
+                'width': float(width * 224),
+                'height': float(height * 224)
+            },
+            'dimensions': {
+                'width_cm': int(100 + width * 100),  # Simulation
+                'height_cm': int(120 + height * 80),
+                'confidence': float(confidence)
+            }
+        }
+    
     def detect_window_opencv(self, image_original: np.ndarray) -> Dict:
         """Détection de fenêtre avec OpenCV (fallback)"""
         try:
@@ -293,38 +409,25 @@ class WindowAnalyzer:
             
             # Tentative de détection avec TensorFlow
             detection_result = None
-            if self.is_tensorflow_available:
+            if self.speculative_detector is not None:
+                logger.info("⚡ Détection spéculative TensorFlow + OpenCV...")
+                detection_result = self.speculative_detector.detect(image_array, image_original)
+            elif self.is_tensorflow_available:
                 try:
                     logger.info("🤖 Tentative détection TensorFlow...")
                     detection_result = self.detect_window_tensorflow(image_array)
                 except Exception as e:
                     logger.warning(f"⚠️ TensorFlow échoué, fallback OpenCV: {e}")
             
-            # Fallback OpenCV si nécessaire
-            if detection_result is None or not detection_result.get('detected', False):
+            # Fallback OpenCV si nécessaire (déjà exécuté en mode spéculatif)
+            if detection_result is None or (
+                self.speculative_detector is None and not detection_result.get('detected', False)
+            ):
                 logger.info("🔧 Utilisation fallback OpenCV...")
                 detection_result = self.detect_window_opencv(image_original)
             
-            # Classification du type de fenêtre
-            classification = self.classify_window_type(detection_result)
-            
-            # Recommandation de kit
-            kit_recommendation = self.recommend_kit(detection_result, classification)
-            
-            # Calcul du score de qualité global
-            quality_score = self.calculate_quality_score(detection_result, classification)
-            
             processing_time = int((time.time() - start_time) * 1000)
-            
-            result = {
-                'success': True,
-                'detection': detection_result,
-                'classification': classification,
-                'kit_recommendation': kit_recommendation,
-                'quality_score': quality_score,
-                'processing_time_ms': processing_time,
-                'timestamp': time.time()
-            }
+            result = self.build_analysis(detection_result, processing_time)
             
             logger.info(f"✅ Analyse terminée en {processing_time}ms")
             return result
@@ -340,6 +443,76 @@ class WindowAnalyzer:
                 'timestamp': time.time()
             }
     
+    def build_analysis(self, detection_result: Dict, processing_time: int) -> Dict:
+        """Classification, recommandation et score à partir d'une détection"""
+        # Classification du type de fenêtre
+        classification = self.classify_window_type(detection_result)
+        
+        # Recommandation de kit
+        kit_recommendation = self.recommend_kit(detection_result, classification)
+        
+        # Calcul du score de qualité global
+        quality_score = self.calculate_quality_score(detection_result, classification)
+        
+        return {
+            'success': True,
+            'detection': detection_result,
+            'classification': classification,
+            'kit_recommendation': kit_recommendation,
+            'quality_score': quality_score,
+            'processing_time_ms': processing_time,
+            'timestamp': time.time()
+        }
+    
+    def analyze_image_batch(self, images: List[bytes]) -> List[Dict]:
+        """Analyse d'un lot d'images brutes avec un seul appel au modèle
+
+        Chaque image en erreur produit un résultat ``success: False`` sans
+        interrompre le reste du lot.
+        """
+        start_time = time.time()
+        results: List[Optional[Dict]] = [None] * len(images)
+        decoded = []
+        
+        # Prétraitement
+        for i, image_bytes in enumerate(images):
+            try:
+                decoded.append((i, *self.decode_image_bytes(image_bytes)))
+            except Exception as e:
+                logger.error(f"❌ Erreur prétraitement image {i}: {e}")
+                results[i] = {'success': False, 'error': str(e), 'timestamp': time.time()}
+        
+        # Détection TensorFlow groupée
+        detections: Dict[int, Dict] = {}
+        if decoded and self.is_tensorflow_available:
+            try:
+                batch_detections = self.detect_windows_tensorflow_batch([d[1] for d in decoded])
+                detections = {d[0]: det for d, det in zip(decoded, batch_detections)}
+            except Exception as e:
+                logger.warning(f"⚠️ TensorFlow échoué sur le lot, fallback OpenCV: {e}")
+        
+        for i, image_array, image_original in decoded:
+            detection_result = detections.get(i)
+            
+            # Fallback OpenCV si nécessaire
+            if detection_result is None or not detection_result.get('detected', False):
+                detection_result = self.detect_window_opencv(image_original)
+            
+            detections[i] = detection_result
+        
+        # Temps moyen par image pour rester comparable à analyze_image
+        per_image_ms = int((time.time() - start_time) * 1000 / max(len(images), 1))
+        
+        # Post-traitement vectorisé (mêmes valeurs que build_analysis)
+        indices = [d[0] for d in decoded]
+        analyses = DetectionBatch([detections[i] for i in indices]).to_dicts(per_image_ms)
+        for i, analysis in zip(indices, analyses):
+            results[i] = analysis
+        for result in results:
+            result.setdefault('processing_time_ms', per_image_ms)
+        
+        return results
+    
     def calculate_quality_score(self, detection: Dict, classification: Dict) -> float:
         """Calcule un score de qualité global"""
         if not detection.get('detected', False):
@@ -370,7 +543,12 @@ class WindowAnalyzer:
             'tensorflow_version': tf.__version__ if self.is_tensorflow_available else None,
             'opencv_version': cv2.__version__,
             'model_loaded': self.model is not None,
-            'fallback_available': self.backup_cascade is not None
+            'model_variant': self.model_variant,
+            'model_version': self.model_version,
+            'model_versions': self.models.status(),
+            'fallback_available': self.backup_cascade is not None,
+            'inference_executor': self.inference_executor.stats() if self.inference_executor else None,
+            'speculation': self.speculative_detector.stats() if self.speculative_detector else None
         }
     
     def batch_analyze(self, images: List[str]) -> List[Dict]:
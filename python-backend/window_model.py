@@ -0,0 +1,51 @@
+"""
+BreezeFrame Window Model
+Construction et chargement du CNN de détection de fenêtres
+
+Module sans analyseur global : il est importé par les processus de répliques
+(inference_executor.py). TensorFlow n'y est importé qu'à l'appel, pour que la
+réplique puisse s'épingler sur ses cœurs avant l'initialisation du runtime.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+def build_window_model():
+    """CNN de détection (x, y, width, height normalisés) en float32"""
+    from tensorflow import keras
+
+    model = keras.Sequential([
+        keras.layers.Conv2D(32, (3, 3), activation='relu', input_shape=(224, 224, 3)),
+        keras.layers.MaxPooling2D((2, 2)),
+        keras.layers.Conv2D(64, (3, 3), activation='relu'),
+        keras.layers.MaxPooling2D((2, 2)),
+        keras.layers.Conv2D(64, (3, 3), activation='relu'),
+        keras.layers.Flatten(),
+        keras.layers.Dense(64, activation='relu'),
+        keras.layers.Dense(4, activation='sigmoid')  # x, y, width, height
+    ])
+
+    model.compile(
+        optimizer='adam',
+        loss='mse',
+        metrics=['mae']
+    )
+    return model
+
+def load_window_model(variant: str, path: Optional[str] = None, weights: Optional[List[np.ndarray]] = None):
+    """Modèle depuis un fichier (Keras ou TFLite int8) ou depuis des poids en mémoire"""
+    if variant == 'int8':
+        from tflite_model import TFLiteModel
+        return TFLiteModel(path)
+
+    if variant != 'float32':
+        raise ValueError(f"Variante de modèle inconnue: {variant}")
+
+    if path is not None:
+        from tensorflow import keras
+        return keras.models.load_model(path)
+
+    model = build_window_model()
+    model.set_weights(weights)
+    return model